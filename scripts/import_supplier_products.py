@@ -2,6 +2,9 @@
 """Quick import script.
 
 Run from project root: python scripts/import_supplier_products.py.
+
+All files are imported by a single importer, in one transaction, so that
+products which appear in several supplier files are deduplicated by SKU.
 """
 
 import os
@@ -37,7 +40,7 @@ if __name__ == '__main__':
         print('=' * 60)
         print(f'Parts created: {summary["created_parts"]}')
         print(f'SupplierParts created: {summary["created_supplier_parts"]}')
-        print(f'Total unique products: {summary["total_unique_products"]}')
+        print(f'Total unique products: {summary["total_products"]}')
 
         if summary['errors']:
             print(f'\nWarnings/Errors ({len(summary["errors"])}):')
@@ -1,6 +1,7 @@
 """Custom Django Admin Site with Import Supplier Products button."""
 
 import os
+import time
 
 from django.contrib import admin, messages
 from django.contrib.auth.decorators import login_required
@@ -8,9 +9,24 @@ from django.http import HttpResponseRedirect
 from django.shortcuts import render
 from django.urls import path
 
-from importer.admin_actions import ImportSupplierProductsForm
 
-from importer.import_supplier_products import SupplierProductImporter
+def import_summary(summary: dict) -> dict:
+    """Return the parts of an import summary which are shown on the import page."""
+    return {
+        'created_parts': summary['created_parts'],
+        'created_supplier_parts': summary['created_supplier_parts'],
+        'total_unique_products': summary['total_products'],
+        'errors': summary.get('errors', []),
+    }
+
+
+def import_success_message(summary: dict) -> str:
+    """Return the success message for a completed import."""
+    return (
+        f'✅ Import zakończony! '
+        f'{summary["created_parts"]} Parts, '
+        f'{summary["created_supplier_parts"]} SupplierParts'
+    )
 
 
 class CustomAdminSite(admin.AdminSite):
@@ -52,9 +68,26 @@ class CustomAdminSite(admin.AdminSite):
 
     def import_supplier_products_view(self, request):
         """View for importing supplier products."""
+        # Imported here so that admin startup does not pay for the importer
+        from django_q.tasks import async_task, fetch
+        from importer.admin_actions import ImportSupplierProductsForm
+
+        from importer.import_supplier_products import run_import
+        from InvenTree.status import is_worker_running
+        from InvenTree.tasks import max_task_timeout
+
         if not request.user.is_staff:
             return HttpResponseRedirect('/admin/login/')
 
+        def render_form(form, summary=None):
+            context = {
+                'form': form,
+                'summary': summary,
+                'site_header': self.site_header,
+                'title': 'Import produktów dostawców',
+            }
+            return render(request, 'admin/import_supplier_products.html', context)
+
         if request.method == 'POST':
             form = ImportSupplierProductsForm(request.POST)
             if form.is_valid():
@@ -68,33 +101,23 @@ class CustomAdminSite(admin.AdminSite):
                 # Get CSV files from folder
                 if not os.path.isdir(folder):
                     form.add_error('folder', f'Folder {folder} nie istnieje')
-                    context = {
-                        'form': form,
-                        'site_header': self.site_header,
-                        'title': 'Import produktów dostawców',
-                    }
-                    return render(
-                        request, 'admin/import_supplier_products.html', context
+                    return render_form(form)
+
+                with os.scandir(folder) as entries:
+                    csv_files = sorted(
+                        entry.name
+                        for entry in entries
+                        if entry.is_file(follow_symlinks=False)
+                        and entry.name.endswith('.csv')
                     )
 
-                csv_files = sorted([
-                    f for f in os.listdir(folder) if f.endswith('.csv')
-                ])
-
                 if len(csv_files) != len(supplier_names):
                     form.add_error(
                         'supplier_names',
                         f'Liczba hurtowni ({len(supplier_names)}) nie zgadza się z liczbą plików CSV ({len(csv_files)}). '
                         f'Znaleźliśmy: {", ".join(csv_files)}',
                     )
-                    context = {
-                        'form': form,
-                        'site_header': self.site_header,
-                        'title': 'Import produktów dostawców',
-                    }
-                    return render(
-                        request, 'admin/import_supplier_products.html', context
-                    )
+                    return render_form(form)
 
                 # Prepare CSV files with suppliers
                 csv_files_with_suppliers = [
@@ -104,49 +127,62 @@ class CustomAdminSite(admin.AdminSite):
                     )
                 ]
 
-                # Run import
+                # Run import (in the background if a worker is available)
                 try:
-                    importer = SupplierProductImporter(verbose=verbose)
-                    summary = importer.import_all(csv_files_with_suppliers)
-
-                    # Store results in session
-                    request.session['import_summary'] = {
-                        'created_parts': summary['created_parts'],
-                        'created_supplier_parts': summary['created_supplier_parts'],
-                        'total_unique_products': summary['total_unique_products'],
-                        'errors': summary.get('errors', []),
-                    }
-
-                    messages.success(
-                        request,
-                        f'✅ Import zakończony! '
-                        f'{summary["created_parts"]} Parts, '
-                        f'{summary["created_supplier_parts"]} SupplierParts',
-                    )
+                    if is_worker_running():
+                        # (with a timeout which stays within the broker's task lock)
+                        request.session['import_task_id'] = async_task(
+                            'importer.import_supplier_products.run_import',
+                            csv_files_with_suppliers,
+                            verbose,
+                            group='importer',
+                            timeout=max_task_timeout(),
+                        )
+                        request.session['import_task_started'] = time.time()
+                        messages.info(
+                            request, '⏳ Import uruchomiony w tle. Odśwież stronę.'
+                        )
+                    else:
+                        summary = run_import(csv_files_with_suppliers, verbose)
+                        request.session['import_summary'] = import_summary(summary)
+                        messages.success(request, import_success_message(summary))
 
                     return HttpResponseRedirect(request.path)
 
                 except Exception as e:
                     messages.error(request, f'❌ Błąd importu: {e!s}')
                     form.add_error(None, str(e))
-                    context = {
-                        'form': form,
-                        'site_header': self.site_header,
-                        'title': 'Import produktów dostawców',
-                    }
-                    return render(
-                        request, 'admin/import_supplier_products.html', context
-                    )
+                    return render_form(form)
         else:
             form = ImportSupplierProductsForm()
 
         # Get last import summary from session
         summary = request.session.pop('import_summary', None)
 
-        context = {
-            'form': form,
-            'summary': summary,
-            'site_header': self.site_header,
-            'title': 'Import produktów dostawców',
-        }
-        return render(request, 'admin/import_supplier_products.html', context)
+        # Check on a background import started by a previous request
+        if task_id := request.session.get('import_task_id'):
+            task = fetch(task_id)
+            started = request.session.get('import_task_started', 0)
+
+            # A task which was killed (e.g. on timeout) never stores a result
+            timed_out = time.time() - started > max_task_timeout() + 60
+
+            if task is None and not timed_out:
+                messages.info(request, '⏳ Import w toku...')
+            else:
+                del request.session['import_task_id']
+                request.session.pop('import_task_started', None)
+
+                if task is None:
+                    messages.error(
+                        request,
+                        '❌ Błąd importu: import nie został ukończony '
+                        '(zadanie w tle zostało przerwane lub przekroczyło limit czasu)',
+                    )
+                elif task.success:
+                    summary = import_summary(task.result)
+                    messages.success(request, import_success_message(task.result))
+                else:
+                    messages.error(request, f'❌ Błąd importu: {task.result}')
+
+        return render_form(form, summary)
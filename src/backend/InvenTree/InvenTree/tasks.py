@@ -159,6 +159,16 @@ def record_task_success(task_name: str):
     set_global_setting(f'_{task_name}_SUCCESS', datetime.now().isoformat(), None)
 
 
+def max_task_timeout() -> int:
+    """Return the longest run time (in seconds) which is safe for an offloaded task.
+
+    The task broker hands a task to another worker once it has been locked for
+    Q_CLUSTER['retry'] seconds, so a task which runs for longer than that
+    can be run more than once at the same time.
+    """
+    return settings.Q_CLUSTER['retry'] - 10
+
+
 def offload_task(
     taskname, *args, force_async=False, force_sync=False, **kwargs
 ) -> bool:
@@ -174,6 +184,12 @@ def offload_task(
     # Extract group information from kwargs
     group = kwargs.pop('group', 'inventree')
 
+    # Extract the (optional) timeout for an asynchronous task from kwargs
+    task_options = {'group': group}
+
+    if timeout := kwargs.pop('timeout', None):
+        task_options['timeout'] = timeout
+
     try:
         import importlib
 
@@ -200,7 +216,7 @@ def offload_task(
     if force_async or (is_worker_running() and not force_sync):
         # Running as asynchronous task
         try:
-            task = AsyncTask(taskname, *args, group=group, **kwargs)
+            task = AsyncTask(taskname, *args, **task_options, **kwargs)
             with tracer.start_as_current_span(f'async worker: {taskname}'):
                 task.run()
         except ImportError:
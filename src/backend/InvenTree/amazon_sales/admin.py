@@ -1,17 +1,74 @@
 """Django Admin configuration for Amazon Sales module."""
 
 from django.contrib import admin, messages
+from django.db import transaction
+from django.db.models import Q
+from django.forms.models import BaseInlineFormSet
+from django.urls import reverse
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 
-from .models import AmazonSalesReport, AmazonSalesReportLine, AmazonSalesReportStatus
+from sql_util.utils import SubqueryCount
+
+from part.models import PartParameter
+
+from .models import (
+    AmazonSalesReport,
+    AmazonSalesReportLine,
+    AmazonSalesReportStatus,
+    asin_template,
+)
+
+STATUS_LABEL_HTML = '<span style="color: {}; font-weight: bold;">{}</span>'
+
+REPORT_STATUS_COLORS = {
+    AmazonSalesReportStatus.UPLOADED: 'gray',
+    AmazonSalesReportStatus.PARSED: 'blue',
+    AmazonSalesReportStatus.MATCHING: 'orange',
+    AmazonSalesReportStatus.READY: 'green',
+    AmazonSalesReportStatus.PROCESSING: 'purple',
+    AmazonSalesReportStatus.COMPLETED: 'darkgreen',
+    AmazonSalesReportStatus.ERROR: 'red',
+}
+
+MATCH_STATUS_COLORS = {
+    AmazonSalesReportLine.MATCH_PENDING: 'gray',
+    AmazonSalesReportLine.MATCH_AUTO: 'green',
+    AmazonSalesReportLine.MATCH_MANUAL: 'blue',
+    AmazonSalesReportLine.MATCH_NOT_FOUND: 'red',
+    AmazonSalesReportLine.MATCH_NO_ASIN: 'orange',
+}
+
+# Label lookups (get_FOO_display() rebuilds the choices dict on every call)
+REPORT_STATUS_NAMES = dict(AmazonSalesReportStatus.CHOICES)
+MATCH_STATUS_NAMES = dict(AmazonSalesReportLine.MATCH_STATUS_CHOICES)
+
+
+class AmazonSalesReportLineFormSet(BaseInlineFormSet):
+    """Inline formset which only renders the first lines of a report."""
+
+    def get_queryset(self):
+        """Limit the queryset to the first MAX_LINES lines."""
+        if not hasattr(self, '_limited_queryset'):
+            self._limited_queryset = super().get_queryset()[
+                : AmazonSalesReportLineInline.MAX_LINES
+            ]
+        return self._limited_queryset
 
 
 class AmazonSalesReportLineInline(admin.TabularInline):
-    """Inline admin for report lines."""
+    """Inline admin for report lines.
+
+    Only the first MAX_LINES lines are shown; the full list is available
+    in the (paginated) report line admin.
+    """
+
+    MAX_LINES = 50
 
     model = AmazonSalesReportLine
-    extra = 1
+    formset = AmazonSalesReportLineFormSet
+    extra = 0
+    max_num = MAX_LINES
     readonly_fields = ['match_status_display', 'sales_order']
     fields = [
         'row_number',
@@ -23,23 +80,22 @@ class AmazonSalesReportLineInline(admin.TabularInline):
         'matched_part',
         'sales_order',
     ]
-    raw_id_fields = ['matched_part']
+    raw_id_fields = ['matched_part', 'sales_order']
     can_delete = True
+    show_change_link = True
+
+    def get_queryset(self, request):
+        """Optimize queryset with select_related."""
+        return (
+            super().get_queryset(request).select_related('matched_part', 'sales_order')
+        )
 
     def match_status_display(self, obj):
         """Display match status with color."""
-        colors = {
-            AmazonSalesReportLine.MATCH_PENDING: 'gray',
-            AmazonSalesReportLine.MATCH_AUTO: 'green',
-            AmazonSalesReportLine.MATCH_MANUAL: 'blue',
-            AmazonSalesReportLine.MATCH_NOT_FOUND: 'red',
-            AmazonSalesReportLine.MATCH_NO_ASIN: 'orange',
-        }
-        color = colors.get(obj.match_status, 'gray')
         return format_html(
-            '<span style="color: {}; font-weight: bold;">{}</span>',
-            color,
-            obj.get_match_status_display(),
+            STATUS_LABEL_HTML,
+            MATCH_STATUS_COLORS.get(obj.match_status, 'gray'),
+            MATCH_STATUS_NAMES.get(obj.match_status, obj.match_status),
         )
 
     match_status_display.short_description = _('Match Status')
@@ -69,6 +125,7 @@ class AmazonSalesReportAdmin(admin.ModelAdmin):
         'matched_lines',
         'unmatched_lines',
         'orders_created',
+        'lines_link',
         'notes',
     ]
     fieldsets = (
@@ -82,6 +139,7 @@ class AmazonSalesReportAdmin(admin.ModelAdmin):
                     'matched_lines',
                     'unmatched_lines',
                     'orders_created',
+                    'lines_link',
                 )
             },
         ),
@@ -97,134 +155,186 @@ class AmazonSalesReportAdmin(admin.ModelAdmin):
 
     def status_display(self, obj):
         """Display status with color."""
-        colors = {
-            AmazonSalesReportStatus.UPLOADED: 'gray',
-            AmazonSalesReportStatus.PARSED: 'blue',
-            AmazonSalesReportStatus.MATCHING: 'orange',
-            AmazonSalesReportStatus.READY: 'green',
-            AmazonSalesReportStatus.PROCESSING: 'purple',
-            AmazonSalesReportStatus.COMPLETED: 'darkgreen',
-            AmazonSalesReportStatus.ERROR: 'red',
-        }
-        color = colors.get(obj.status, 'gray')
         return format_html(
-            '<span style="color: {}; font-weight: bold;">{}</span>',
-            color,
-            obj.get_status_display(),
+            STATUS_LABEL_HTML,
+            REPORT_STATUS_COLORS.get(obj.status, 'gray'),
+            REPORT_STATUS_NAMES.get(obj.status, obj.status),
         )
 
     status_display.short_description = _('Status')
 
+    def lines_link(self, obj):
+        """Link to the full (paginated) list of lines for this report."""
+        if not obj.pk:
+            return '-'
+
+        url = reverse('admin:amazon_sales_amazonsalesreportline_changelist')
+        return format_html(
+            '<a href="{}?report__id__exact={}">{}</a>', url, obj.pk, _('All lines')
+        )
+
+    lines_link.short_description = _('Report Lines')
+
+    def _skip_ineligible(self, request, queryset, eligible, message):
+        """Report (in one message) the selected reports which are not eligible."""
+        skipped = queryset.exclude(eligible).count()
+        if skipped:
+            self.message_user(request, f'{skipped} {message}', messages.WARNING)
+        return queryset.filter(eligible).select_for_update()
+
+    def _message_summary(self, request, summary, details, level):
+        """Emit a single message summarising an action across all reports."""
+        if details:
+            summary = f'{summary}: {"; ".join(details)}'
+        self.message_user(request, summary, level)
+
     @admin.action(description=_('1️⃣ Parse CSV file'))
     def action_parse_csv(self, request, queryset):
         """Parse uploaded CSV files."""
-        for report in queryset:
-            if report.status not in [
-                AmazonSalesReportStatus.UPLOADED,
-                AmazonSalesReportStatus.ERROR,
-            ]:
-                self.message_user(
-                    request,
-                    f'{report}: Already parsed. Status: {report.get_status_display()}',
-                    messages.WARNING,
-                )
-                continue
-
-            lines, error = report.parse_csv()
+        eligible = self._skip_ineligible(
+            request,
+            queryset,
+            Q(
+                status__in=[
+                    AmazonSalesReportStatus.UPLOADED,
+                    AmazonSalesReportStatus.ERROR,
+                ]
+            ),
+            'report(s) already parsed - skipped',
+        )
 
-            if error:
-                self.message_user(
-                    request, f'{report}: Error parsing CSV - {error}', messages.ERROR
-                )
-            else:
-                self.message_user(
-                    request,
-                    f'{report}: Parsed {lines} lines successfully',
-                    messages.SUCCESS,
-                )
+        parsed = 0
+        total_lines = 0
+        failed = []
+
+        with transaction.atomic():
+            for report in eligible.iterator(chunk_size=50):
+                lines, error = report.parse_csv()
+
+                if error:
+                    failed.append(f'{report} - {error}')
+                else:
+                    parsed += 1
+                    total_lines += lines
+
+        self._message_summary(
+            request,
+            f'Parsed {parsed} report(s) ({total_lines} lines), {len(failed)} error(s)',
+            failed,
+            messages.ERROR if failed else messages.SUCCESS,
+        )
 
     @admin.action(description=_('2️⃣ Match ASINs to Parts'))
     def action_match_asins(self, request, queryset):
         """Match ASINs in report lines to Parts."""
-        for report in queryset:
-            if report.status < AmazonSalesReportStatus.PARSED:
-                self.message_user(
-                    request, f'{report}: Must parse CSV first', messages.WARNING
-                )
-                continue
+        eligible = self._skip_ineligible(
+            request,
+            queryset,
+            Q(status__gte=AmazonSalesReportStatus.PARSED),
+            'report(s) must parse CSV first - skipped',
+        )
 
-            matched, unmatched = report.match_asins()
+        total_matched = 0
+        total_unmatched = 0
+        incomplete = []
 
-            self.message_user(
-                request,
-                f'{report}: Matched {matched}, Unmatched {unmatched}',
-                messages.SUCCESS if unmatched == 0 else messages.WARNING,
-            )
+        with transaction.atomic():
+            for report in eligible.iterator(chunk_size=50):
+                matched, unmatched = report.match_asins()
+                total_matched += matched
+                total_unmatched += unmatched
+
+                if unmatched:
+                    incomplete.append(f'{report} ({unmatched} unmatched)')
+
+        self._message_summary(
+            request,
+            f'Matched {total_matched}, Unmatched {total_unmatched}',
+            incomplete,
+            messages.WARNING if total_unmatched else messages.SUCCESS,
+        )
 
     @admin.action(description=_('3️⃣ Check if ready (all matched)'))
     def action_check_ready(self, request, queryset):
         """Check if all lines are matched and ready to process."""
-        for report in queryset:
-            if report.check_ready():
-                self.message_user(
-                    request,
-                    f'{report}: ✅ Ready to create Sales Orders!',
-                    messages.SUCCESS,
-                )
-            else:
-                unmatched = report.lines.filter(
-                    match_status__in=[
-                        AmazonSalesReportLine.MATCH_NOT_FOUND,
-                        AmazonSalesReportLine.MATCH_NO_ASIN,
-                    ]
-                ).count()
-                self.message_user(
-                    request,
-                    f'{report}: ❌ Still {unmatched} unmatched lines. '
-                    f'Please match them manually before proceeding.',
-                    messages.WARNING,
-                )
+        ready = 0
+        not_ready = []
+
+        with transaction.atomic():
+            for report in queryset.select_for_update().iterator(chunk_size=50):
+                if report.check_ready():
+                    ready += 1
+                else:
+                    unmatched = report.lines.filter(
+                        match_status__in=[
+                            AmazonSalesReportLine.MATCH_NOT_FOUND,
+                            AmazonSalesReportLine.MATCH_NO_ASIN,
+                        ]
+                    ).count()
+                    not_ready.append(f'{report} ({unmatched} unmatched)')
+
+        if not_ready:
+            self._message_summary(
+                request,
+                f'✅ {ready} report(s) ready, ❌ {len(not_ready)} still have '
+                f'unmatched lines. Please match them manually before proceeding',
+                not_ready,
+                messages.WARNING,
+            )
+        else:
+            self.message_user(
+                request,
+                f'✅ {ready} report(s) ready to create Sales Orders!',
+                messages.SUCCESS,
+            )
 
     @admin.action(description=_('4️⃣ Create Sales Orders'))
     def action_create_sales_orders(self, request, queryset):
         """Create Sales Orders from matched lines."""
-        for report in queryset:
-            if report.status < AmazonSalesReportStatus.MATCHING:
-                self.message_user(
-                    request, f'{report}: Must match ASINs first', messages.WARNING
-                )
-                continue
-
-            # Check for unmatched
-            unmatched = report.lines.filter(
-                match_status__in=[
-                    AmazonSalesReportLine.MATCH_NOT_FOUND,
-                    AmazonSalesReportLine.MATCH_NO_ASIN,
-                ]
-            ).count()
-
-            if unmatched > 0:
-                self.message_user(
-                    request,
-                    f'{report}: {unmatched} lines still unmatched! '
-                    f'Proceeding will skip those lines.',
-                    messages.WARNING,
-                )
+        eligible = self._skip_ineligible(
+            request,
+            queryset,
+            Q(status__gte=AmazonSalesReportStatus.MATCHING),
+            'report(s) must match ASINs first - skipped',
+        )
 
-            orders, lines, errors = report.create_sales_orders()
+        # Count unmatched lines alongside each report (no per-report query)
+        eligible = eligible.annotate(
+            unmatched_count=SubqueryCount(
+                'lines',
+                filter=Q(
+                    match_status__in=[
+                        AmazonSalesReportLine.MATCH_NOT_FOUND,
+                        AmazonSalesReportLine.MATCH_NO_ASIN,
+                    ]
+                ),
+            )
+        )
 
-            if errors:
-                self.message_user(
-                    request,
-                    f'{report}: Created {orders} orders, {len(errors)} errors',
-                    messages.WARNING,
-                )
-            else:
-                self.message_user(
-                    request,
-                    f'{report}: ✅ Created {orders} Sales Orders ({lines} line items)',
-                    messages.SUCCESS,
-                )
+        total_orders = 0
+        total_lines = 0
+        details = []
+
+        with transaction.atomic():
+            for report in eligible.iterator(chunk_size=100):
+                if report.unmatched_count > 0:
+                    details.append(
+                        f'{report}: {report.unmatched_count} unmatched lines skipped'
+                    )
+
+                orders, lines, errors = report.create_sales_orders()
+                total_orders += orders
+                total_lines += lines
+
+                if errors:
+                    details.append(f'{report}: {len(errors)} errors')
+
+        self._message_summary(
+            request,
+            f'Created {total_orders} Sales Orders ({total_lines} line items)',
+            details,
+            messages.WARNING if details else messages.SUCCESS,
+        )
 
 
 @admin.register(AmazonSalesReportLine)
@@ -259,25 +369,58 @@ class AmazonSalesReportLineAdmin(admin.ModelAdmin):
     @admin.action(description=_('Assign ASIN to matched Part'))
     def action_assign_asin_to_part(self, request, queryset):
         """Assign ASIN as Part Parameter to matched parts."""
-        assigned = 0
-        for line in queryset:
-            if line.matched_part and line.asin:
-                if line.assign_asin_to_part():
-                    assigned += 1
+        # One ASIN per part (a part can only hold a single ASIN parameter)
+        asin_by_part = dict(
+            queryset.filter(matched_part__isnull=False)
+            .exclude(asin='')
+            .values_list('matched_part_id', 'asin')
+        )
+
+        if not asin_by_part:
+            self.message_user(request, 'Assigned ASIN to 0 parts', messages.SUCCESS)
+            return
+
+        template = asin_template()
+
+        # Update existing parameters whose value differs
+        changed = []
+        for param in PartParameter.objects.filter(
+            template=template, part_id__in=asin_by_part.keys()
+        ):
+            asin = asin_by_part.pop(param.part_id)
+            if param.data != asin:
+                param.data = asin
+                param.calculate_numeric_value()
+                changed.append(param)
+
+        if changed:
+            PartParameter.objects.bulk_update(
+                changed, ['data', 'data_numeric'], batch_size=1000
+            )
+
+        # Create parameters for parts which do not have one yet
+        new_params = []
+        for part_id, asin in asin_by_part.items():
+            param = PartParameter(part_id=part_id, template=template, data=asin)
+            param.calculate_numeric_value()
+            new_params.append(param)
+
+        PartParameter.objects.bulk_create(
+            new_params, batch_size=1000, ignore_conflicts=True
+        )
 
         self.message_user(
-            request, f'Assigned ASIN to {assigned} parts', messages.SUCCESS
+            request,
+            f'Assigned ASIN to {len(new_params)} parts, updated {len(changed)}',
+            messages.SUCCESS,
         )
 
     @admin.action(description=_('Mark as manually matched'))
     def action_mark_manual_match(self, request, queryset):
         """Mark selected lines as manually matched."""
-        updated = 0
-        for line in queryset:
-            if line.matched_part:
-                line.match_status = AmazonSalesReportLine.MATCH_MANUAL
-                line.save()
-                updated += 1
+        updated = queryset.filter(matched_part__isnull=False).update(
+            match_status=AmazonSalesReportLine.MATCH_MANUAL
+        )
 
         self.message_user(
             request, f'Marked {updated} lines as manually matched', messages.SUCCESS
@@ -0,0 +1,105 @@
+# Generated by Django 5.2.8 on 2026-10-16 09:12
+
+import logging
+from datetime import UTC, datetime
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+from dateutil.parser import isoparse
+
+logger = logging.getLogger("inventree")
+
+
+def convert_shipment_dates(apps, schema_editor):
+    """Parse the stored ISO 8601 shipment date strings into the new datetime field."""
+
+    AmazonSalesReportLine = apps.get_model("amazon_sales", "AmazonSalesReportLine")
+
+    lines = []
+    dropped = 0
+
+    for line in AmazonSalesReportLine.objects.exclude(shipment_date="").only(
+        "pk", "shipment_date"
+    ):
+        try:
+            try:
+                dt = datetime.fromisoformat(line.shipment_date)
+            except ValueError:
+                dt = isoparse(line.shipment_date)
+        except (ValueError, OverflowError):
+            # Unparseable dates are dropped
+            logger.warning(
+                f"Dropping invalid shipment date '{line.shipment_date}' for AmazonSalesReportLine {line.pk}"
+            )
+            dropped += 1
+            continue
+
+        if settings.USE_TZ:
+            if timezone.is_naive(dt):
+                dt = dt.replace(tzinfo=UTC)
+        elif timezone.is_aware(dt):
+            dt = timezone.make_naive(dt, UTC)
+
+        line.shipment_datetime = dt
+        lines.append(line)
+
+    AmazonSalesReportLine.objects.bulk_update(
+        lines, ["shipment_datetime"], batch_size=1000
+    )
+
+    if lines or dropped:
+        logger.info(
+            f"Converted {len(lines)} shipment dates, dropped {dropped} invalid dates"
+        )
+
+
+def revert_shipment_dates(apps, schema_editor):
+    """Write the datetime values back to the shipment date strings, in ISO 8601 format."""
+
+    AmazonSalesReportLine = apps.get_model("amazon_sales", "AmazonSalesReportLine")
+
+    lines = []
+
+    for line in AmazonSalesReportLine.objects.exclude(shipment_datetime=None).only(
+        "pk", "shipment_datetime"
+    ):
+        line.shipment_date = line.shipment_datetime.isoformat()
+        lines.append(line)
+
+    AmazonSalesReportLine.objects.bulk_update(lines, ["shipment_date"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("amazon_sales", "0002_amazonsalesreport_location"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="amazonsalesreportline",
+            name="shipment_datetime",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(
+            convert_shipment_dates, reverse_code=revert_shipment_dates
+        ),
+        migrations.RemoveField(
+            model_name="amazonsalesreportline",
+            name="shipment_date",
+        ),
+        migrations.RenameField(
+            model_name="amazonsalesreportline",
+            old_name="shipment_datetime",
+            new_name="shipment_date",
+        ),
+        migrations.AlterField(
+            model_name="amazonsalesreportline",
+            name="shipment_date",
+            field=models.DateTimeField(
+                blank=True, db_index=True, null=True, verbose_name="Shipment Date"
+            ),
+        ),
+    ]
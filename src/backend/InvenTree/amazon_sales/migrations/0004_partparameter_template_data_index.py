@@ -0,0 +1,51 @@
+# Index on part_partparameter (template, data), used to look up parts by ASIN
+
+from django.db import migrations
+
+
+def index_exists(connection):
+    """Return True if the part_param_template_data_idx index exists."""
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, 'part_partparameter'
+        )
+
+    return 'part_param_template_data_idx' in constraints
+
+
+def create_template_data_index(apps, schema_editor):
+    """Create the part_param_template_data_idx index (if it does not already exist)."""
+    if index_exists(schema_editor.connection):
+        return
+
+    schema_editor.execute(
+        'CREATE INDEX part_param_template_data_idx '
+        'ON part_partparameter (template_id, data)'
+    )
+
+
+def drop_template_data_index(apps, schema_editor):
+    """Remove the part_param_template_data_idx index."""
+    if not index_exists(schema_editor.connection):
+        return
+
+    if schema_editor.connection.vendor == 'mysql':
+        schema_editor.execute(
+            'DROP INDEX part_param_template_data_idx ON part_partparameter'
+        )
+    else:
+        schema_editor.execute('DROP INDEX part_param_template_data_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("amazon_sales", "0003_amazonsalesreportline_shipment_datetime"),
+        ("part", "0143_alter_part_image"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_template_data_index, reverse_code=drop_template_data_index
+        ),
+    ]
@@ -1,12 +1,21 @@
 """Models for Amazon Sales Report importer."""
 
 import csv
+from collections import defaultdict
+from datetime import UTC, datetime
 from decimal import Decimal, InvalidOperation
-from io import TextIOWrapper
-
-from django.db import models
+from io import BufferedReader, TextIOWrapper
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import F, Sum, Value
+from django.db.models.functions import Concat
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from dateutil.parser import isoparse
+
 from company.models import Company
 from order.models import SalesOrder, SalesOrderLineItem
 from order.status_codes import SalesOrderStatus
@@ -35,6 +44,114 @@ class AmazonSalesReportStatus:
     ]
 
 
+DECIMAL_ZERO = Decimal('0')
+
+# Number of report lines fetched (and updated) at a time when matching ASINs
+MATCH_BATCH_SIZE = 2000
+
+# Read buffer size for report files
+CSV_BUFFER_SIZE = 1 << 20
+
+# Report line fields which are not read from the CSV file,
+# and so are not validated when parsing it
+LINE_UNCHECKED_FIELDS = ['report', 'matched_part', 'match_status', 'sales_order']
+
+# Report columns (in the order they are read), with the default value
+# used when a column is missing from the file
+REPORT_COLUMNS = {
+    'Customer Shipment Date': '',
+    'Merchant SKU': '',
+    'FNSKU': '',
+    'ASIN': '',
+    'FC': '',
+    'Quantity': '1',
+    'Amazon Order Id': '',
+    'Currency': 'GBP',
+    'Product Amount': '0',
+    'Shipping Amount': '0',
+    'Shipment To City': '',
+    'Shipment To State': '',
+    'Shipment To Postal Code': '',
+}
+
+
+def parse_shipment_date(value: str) -> datetime:
+    """Parse an ISO 8601 shipment date (e.g. "2024-10-31T22:01:54+00:00").
+
+    Uses the (much faster) stdlib parser, falling back to dateutil for
+    any non-standard formats. Dates without an offset are taken as UTC.
+
+    Returns:
+        A timezone aware datetime if timezone support is active,
+        otherwise a naive (UTC) datetime
+
+    Raises:
+        ValueError: If the value cannot be parsed
+    """
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        dt = isoparse(value)
+
+    if settings.USE_TZ:
+        if timezone.is_naive(dt):
+            dt = dt.replace(tzinfo=UTC)
+    elif timezone.is_aware(dt):
+        dt = timezone.make_naive(dt, UTC)
+
+    return dt
+
+
+def asin_template() -> PartParameterTemplate:
+    """Return the 'ASIN' PartParameterTemplate (created if required).
+
+    Look this up once per operation (not per report line), rather than caching
+    the instance, which could be left stale by a rollback or a delete elsewhere.
+    """
+    return PartParameterTemplate.objects.get_or_create(
+        name='ASIN', defaults={'description': 'Amazon Standard Identification Number'}
+    )[0]
+
+
+def amazon_uk_customer() -> Company:
+    """Return the 'Amazon UK' customer Company (created if required)."""
+    return Company.objects.get_or_create(
+        name='Amazon UK',
+        defaults={'is_customer': True, 'description': 'Amazon UK Marketplace'},
+    )[0]
+
+
+def schedule_part_stock_updates(part_ids):
+    """Run the StockItem post_save hooks once for each of the provided parts.
+
+    Stock written with bulk_create() or update() does not trigger
+    after_save_stock_item, so the low-stock notification and pricing
+    update are scheduled here instead.
+    """
+    import InvenTree.ready
+    from InvenTree.tasks import offload_task
+    from part import tasks as part_tasks
+
+    # (with the same checks as after_save_stock_item)
+    if InvenTree.ready.isImportingData():
+        return
+
+    notify = InvenTree.ready.canAppAccessDatabase(allow_test=True)
+    pricing = InvenTree.ready.canAppAccessDatabase(allow_test=settings.TESTING_PRICING)
+
+    for part in Part.objects.prefetch_related(None).filter(pk__in=part_ids):
+        if notify:
+            offload_task(
+                part_tasks.notify_low_stock_if_required,
+                part.pk,
+                group='notification',
+                force_async=True,
+            )
+
+        if pricing:
+            part.schedule_pricing_update(create=True, refresh=False)
+
+
 def amazon_report_upload_path(instance, filename):
     """Generate upload path for Amazon sales report."""
     return f'amazon_reports/{instance.name or "report"}_{filename}'
@@ -111,10 +228,21 @@ class AmazonSalesReport(models.Model):
             return f'{self.name} ({self.get_status_display()})'
         return f'Report {self.pk} ({self.get_status_display()})'
 
-    def log(self, message: str):
-        """Add a log message to notes."""
-        self.notes += f'{message}\n'
-        self.save(update_fields=['notes'])
+    def log(self, *messages: str):
+        """Add one or more log messages to notes.
+
+        The messages are appended by the database in a single UPDATE,
+        rather than rewriting the (ever growing) notes field.
+        """
+        if not messages:
+            return
+
+        text = ''.join(f'{message}\n' for message in messages)
+
+        self.notes += text
+        AmazonSalesReport.objects.filter(pk=self.pk).update(
+            notes=Concat('notes', Value(text), output_field=models.TextField())
+        )
 
     def parse_csv(self) -> tuple[int, str]:
         """Parse the uploaded CSV file and create AmazonSalesReportLine entries.
@@ -122,95 +250,170 @@ class AmazonSalesReport(models.Model):
         Returns:
             Tuple of (lines_created, error_message)
         """
-        # Clear existing lines and reset statistics
-        self.lines.all().delete()
-        self.notes = ''
-        self.total_lines = 0
-        self.matched_lines = 0
-        self.unmatched_lines = 0
-        self.orders_created = 0
-
         try:
-            self.csv_file.seek(0)
-            # Handle BOM encoding
-            wrapper = TextIOWrapper(self.csv_file, encoding='utf-8-sig')
-            reader = csv.DictReader(wrapper)
+            # Read the (typically multi MB) file through a large buffer
+            self.csv_file.open('rb')
+            buffer = BufferedReader(self.csv_file.file, buffer_size=CSV_BUFFER_SIZE)
+            # Handle BOM encoding, and leave line endings to the csv module
+            wrapper = TextIOWrapper(buffer, encoding='utf-8-sig', newline='')
+            reader = csv.reader(wrapper)
+
+            # Resolve the column indexes once, from the header row.
+            # Columns missing from the file are read from their default values,
+            # which are appended to each row
+            header = next(reader, [])
+            width = len(header)
+            missing = [column for column in REPORT_COLUMNS if column not in header]
+            defaults = [REPORT_COLUMNS[column] for column in missing]
+            index = [
+                header.index(column)
+                if column in header
+                else width + missing.index(column)
+                for column in REPORT_COLUMNS
+            ]
 
-            lines_created = 0
+            (
+                i_date,
+                i_sku,
+                i_fnsku,
+                i_asin,
+                i_fc,
+                i_quantity,
+                i_order_id,
+                i_currency,
+                i_product_amount,
+                i_shipping_amount,
+                i_city,
+                i_state,
+                i_postal_code,
+            ) = index
+
+            # Bind the per-row helpers to locals for the loop below
+            parse_date = parse_shipment_date
+            parse_decimal = self._parse_decimal
+
+            lines = []
+            row_errors = []
             for row_num, row in enumerate(reader, start=2):
+                if not row:
+                    # Skip blank lines
+                    continue
+
+                # Short rows get empty strings (not None) so that they can be
+                # bulk inserted into the non-null text columns
+                if len(row) != width:
+                    row = row[:width] + [''] * (width - len(row))
+
+                row += defaults
+
                 try:
                     # Parse quantity
-                    quantity = int(row.get('Quantity', 1))
+                    quantity = int(row[i_quantity])
 
-                    # Parse amounts
-                    product_amount = self._parse_decimal(row.get('Product Amount', '0'))
-                    shipping_amount = self._parse_decimal(
-                        row.get('Shipping Amount', '0')
-                    )
+                    # Parse shipment date (keep the line even if the date is invalid)
+                    shipment_date = None
+                    if raw_date := row[i_date]:
+                        try:
+                            shipment_date = parse_date(raw_date)
+                        except (ValueError, OverflowError):
+                            row_errors.append(
+                                f'Row {row_num}: Invalid shipment date "{raw_date}"'
+                            )
 
-                    AmazonSalesReportLine.objects.create(
+                    line = AmazonSalesReportLine(
                         report=self,
                         row_number=row_num,
-                        shipment_date=row.get('Customer Shipment Date', ''),
-                        merchant_sku=row.get('Merchant SKU', ''),
-                        fnsku=row.get('FNSKU', ''),
-                        asin=row.get('ASIN', ''),
-                        fulfillment_center=row.get('FC', ''),
+                        shipment_date=shipment_date,
+                        merchant_sku=row[i_sku],
+                        fnsku=row[i_fnsku],
+                        asin=row[i_asin],
+                        fulfillment_center=row[i_fc],
                         quantity=quantity,
-                        amazon_order_id=row.get('Amazon Order Id', ''),
-                        currency=row.get('Currency', 'GBP'),
-                        product_amount=product_amount,
-                        shipping_amount=shipping_amount,
-                        city=row.get('Shipment To City', ''),
-                        state=row.get('Shipment To State', ''),
-                        postal_code=row.get('Shipment To Postal Code', ''),
+                        amazon_order_id=row[i_order_id],
+                        currency=row[i_currency] or REPORT_COLUMNS['Currency'],
+                        product_amount=parse_decimal(row[i_product_amount]),
+                        shipping_amount=parse_decimal(row[i_shipping_amount]),
+                        city=row[i_city],
+                        state=row[i_state],
+                        postal_code=row[i_postal_code],
                     )
-                    lines_created += 1
+
+                    # bulk_create() does not check the values, so reject any row
+                    # which would not fit its column (length, decimal digits)
+                    try:
+                        line.clean_fields(exclude=LINE_UNCHECKED_FIELDS)
+                    except ValidationError as e:
+                        row_errors.append(
+                            f'Row {row_num}: Invalid value - '
+                            + '; '.join(
+                                f'{field}: {" ".join(messages)}'
+                                for field, messages in e.message_dict.items()
+                            )
+                        )
+                        continue
+
+                    lines.append(line)
                 except Exception as e:
-                    self.log(f'Row {row_num}: Error parsing - {e}')
-
-            self.total_lines = lines_created
-            self.status = AmazonSalesReportStatus.PARSED
-            
-            # Extract date_from and date_to from shipment dates
-            if lines_created > 0:
-                dates = []
-                for line in self.lines.all():
-                    if line.shipment_date:
-                        try:
-                            # Parse ISO format datetime (e.g., "2024-10-31T22:01:54+00:00")
-                            from dateutil import parser as date_parser
-                            parsed_dt = date_parser.isoparse(line.shipment_date)
-                            dates.append(parsed_dt.date())
-                        except (ValueError, TypeError):
-                            pass
-                
+                    row_errors.append(f'Row {row_num}: Error parsing - {e}')
+
+            lines_created = len(lines)
+
+            # Extract date_from and date_to from the parsed shipment dates
+            # (from the lines in memory - no need to read them back)
+            dates = [line.shipment_date for line in lines if line.shipment_date]
+
+            # Replace the existing lines and statistics in a single transaction
+            # (the previous lines are kept if anything fails)
+            with transaction.atomic():
+                self.lines.all().delete()
+
+                self.notes = ''
+                self.total_lines = lines_created
+                self.status = AmazonSalesReportStatus.PARSED
+
                 if dates:
-                    self.date_from = min(dates)
-                    self.date_to = max(dates)
-            
-            # Calculate matched and unmatched lines
-            self.matched_lines = self.lines.filter(matched_part__isnull=False).count()
-            self.unmatched_lines = self.lines.filter(matched_part__isnull=True).count()
-            
-            self.save()
+                    self.date_from = min(dates).date()
+                    self.date_to = max(dates).date()
+
+                # Freshly parsed lines are never matched
+                self.matched_lines = 0
+                self.unmatched_lines = lines_created
+                self.orders_created = 0
+
+                self.save(
+                    update_fields=[
+                        'notes',
+                        'total_lines',
+                        'matched_lines',
+                        'unmatched_lines',
+                        'orders_created',
+                        'date_from',
+                        'date_to',
+                        'status',
+                    ]
+                )
+
+                self.log(*row_errors)
+
+                AmazonSalesReportLine.objects.bulk_create(lines, batch_size=1000)
 
             return lines_created, ''
 
         except Exception as e:
             self.status = AmazonSalesReportStatus.ERROR
             self.log(f'Error parsing CSV: {e}')
-            self.save()
+            self.save(update_fields=['status'])
             return 0, str(e)
 
-    def _parse_decimal(self, value: str) -> Decimal:
+    @staticmethod
+    def _parse_decimal(value: str) -> Decimal:
         """Parse a decimal value from string."""
         if not value:
-            return Decimal('0')
+            return DECIMAL_ZERO
         try:
-            return Decimal(value.replace(',', '.'))
+            return Decimal(value.replace(',', '.') if ',' in value else value)
         except InvalidOperation:
-            return Decimal('0')
+            return DECIMAL_ZERO
 
     def match_asins(self) -> tuple[int, int]:
         """Match ASINs to Parts using PartParameter.
@@ -218,48 +421,57 @@ class AmazonSalesReport(models.Model):
         Returns:
             Tuple of (matched_count, unmatched_count)
         """
-        # Get ASIN template
-        try:
-            asin_template = PartParameterTemplate.objects.get(name='ASIN')
-        except PartParameterTemplate.DoesNotExist:
-            self.log('Error: ASIN parameter template not found!')
-            return 0, self.lines.count()
-
-        # Reset match statuses before matching
-        for line in self.lines.all():
-            line.matched_part = None
-            line.match_status = AmazonSalesReportLine.MATCH_PENDING
-            line.save()
+        # Map ASIN -> Part ID in a single query
+        # (reverse pk order, so that the oldest parameter wins for duplicate ASINs)
+        part_by_asin = dict(
+            PartParameter.objects.filter(
+                template=asin_template(), data__in=self.lines.values('asin')
+            )
+            .order_by('-pk')
+            .values_list('data', 'part_id')
+        )
 
         matched = 0
         unmatched = 0
+        batch = []
+
+        with transaction.atomic():
+            # Stream the lines (keeping memory bounded for large reports)
+            # and update them in batches.
+            # Every line is (re)assigned here, which also resets any previous match
+            for line in self.lines.only('pk', 'asin').iterator(
+                chunk_size=MATCH_BATCH_SIZE
+            ):
+                line.matched_part_id = (
+                    part_by_asin.get(line.asin) if line.asin else None
+                )
 
-        for line in self.lines.all():
-            if not line.asin:
-                line.match_status = AmazonSalesReportLine.MATCH_NO_ASIN
-                line.save()
-                unmatched += 1
-                continue
-
-            # Find Part by ASIN
-            param = PartParameter.objects.filter(
-                template=asin_template, data=line.asin
-            ).first()
-
-            if param:
-                line.matched_part = param.part
-                line.match_status = AmazonSalesReportLine.MATCH_AUTO
-                matched += 1
-            else:
-                line.match_status = AmazonSalesReportLine.MATCH_NOT_FOUND
-                unmatched += 1
+                if not line.asin:
+                    line.match_status = AmazonSalesReportLine.MATCH_NO_ASIN
+                    unmatched += 1
+                elif line.matched_part_id:
+                    line.match_status = AmazonSalesReportLine.MATCH_AUTO
+                    matched += 1
+                else:
+                    line.match_status = AmazonSalesReportLine.MATCH_NOT_FOUND
+                    unmatched += 1
+
+                batch.append(line)
+
+                if len(batch) >= MATCH_BATCH_SIZE:
+                    AmazonSalesReportLine.objects.bulk_update(
+                        batch, ['matched_part', 'match_status']
+                    )
+                    batch = []
 
-            line.save()
+            AmazonSalesReportLine.objects.bulk_update(
+                batch, ['matched_part', 'match_status']
+            )
 
         self.matched_lines = matched
         self.unmatched_lines = unmatched
         self.status = AmazonSalesReportStatus.MATCHING
-        self.save()
+        self.save(update_fields=['matched_lines', 'unmatched_lines', 'status'])
 
         return matched, unmatched
 
@@ -270,11 +482,11 @@ class AmazonSalesReport(models.Model):
                 AmazonSalesReportLine.MATCH_NOT_FOUND,
                 AmazonSalesReportLine.MATCH_NO_ASIN,
             ]
-        ).count()
+        ).exists()
 
-        if unmatched == 0:
+        if not unmatched:
             self.status = AmazonSalesReportStatus.READY
-            self.save()
+            self.save(update_fields=['status'])
             return True
         return False
 
@@ -284,30 +496,56 @@ class AmazonSalesReport(models.Model):
         Returns:
             Tuple of (orders_created, lines_processed, errors)
         """
-        from django.db import transaction
-
         from stock.models import StockItem
 
         errors = []
         lines_processed = 0
 
         self.status = AmazonSalesReportStatus.PROCESSING
-        self.save()
+        self.save(update_fields=['status'])
 
         try:
             with transaction.atomic():
-                # Ensure customer exists
-                customer, _ = Company.objects.get_or_create(
-                    name='Amazon UK',
-                    defaults={
-                        'is_customer': True,
-                        'description': 'Amazon UK Marketplace',
-                    },
+                if not self.location:
+                    raise ValueError(
+                        'Stock Location is required to allocate stock items'
+                    )
+
+                # Check that there is enough stock of every part before writing
+                # anything, comparing the totals per part in two queries
+                required = dict(
+                    self.lines.filter(matched_part__isnull=False)
+                    .order_by()
+                    .values_list('matched_part_id')
+                    .annotate(Sum('quantity'))
+                )
+                available = dict(
+                    StockItem.objects.filter(
+                        part_id__in=required.keys(), location=self.location
+                    )
+                    .order_by()
+                    .values_list('part_id')
+                    .annotate(Sum('quantity'))
                 )
 
+                if short := [
+                    part_id
+                    for part_id, quantity in required.items()
+                    if available.get(part_id, 0) < quantity
+                ]:
+                    names = Part.objects.filter(pk__in=short).values_list(
+                        'name', flat=True
+                    )
+                    raise ValueError(
+                        f'Insufficient stock in {self.location.name}: '
+                        + ', '.join(sorted(names))
+                    )
+
+                # Ensure customer exists
+                customer = amazon_uk_customer()
+
                 # Create a unique reference for this report (always create new SO)
                 # Use timestamp to ensure uniqueness even for identical reports
-                from django.utils import timezone
                 timestamp = timezone.now().strftime('%Y%m%d%H%M%S')
                 report_reference = f'AMZ-{self.name or self.pk}-{timestamp}'
 
@@ -321,86 +559,167 @@ class AmazonSalesReport(models.Model):
                 )
                 self.log(f'Created Sales Order: {so.reference}')
 
-                # Create default shipment
                 from order.models import SalesOrderAllocation, SalesOrderShipment
-                from dateutil import parser as date_parser
 
-                # Process each matched line
-                for line in self.lines.filter(matched_part__isnull=False):
+                lines = list(
+                    self.lines.filter(matched_part__isnull=False)
+                    .select_related('matched_part')
+                    .only(
+                        'row_number',
+                        'shipment_date',
+                        'quantity',
+                        'product_amount',
+                        'matched_part__id',
+                        'matched_part__name',
+                    )
+                )
+
+                part_ids = {line.matched_part_id for line in lines}
+
+                # Ensure parts are salable (in a single UPDATE)
+                Part.objects.filter(pk__in=part_ids, salable=False).update(salable=True)
+
+                # Fetch (and lock) all candidate stock items in a single query,
+                # largest first, so that each line can be allocated in memory
+                stock_by_part = defaultdict(list)
+
+                for item in (
+                    StockItem.objects.select_for_update()
+                    .filter(part_id__in=part_ids, location=self.location)
+                    .order_by('-quantity')
+                ):
+                    stock_by_part[item.part_id].append(item)
+
+                # Validate each line and pick its stock item
+                allocated = []
+                line_errors = []
+
+                for line in lines:
                     try:
-                        # Parse shipment date from Amazon report
-                        line_date = timezone.now().date()
-                        if line.shipment_date:
-                            try:
-                                parsed_dt = date_parser.isoparse(line.shipment_date)
-                                line_date = parsed_dt.date()
-                            except (ValueError, TypeError):
-                                pass
-
-                        # Create/get shipment for this specific date
-                        shipment, _ = SalesOrderShipment.objects.get_or_create(
-                            order=so,
-                            reference=line_date.isoformat(),  # Use date as reference
-                            defaults={'shipment_date': line_date}
+                        part = line.matched_part
+
+                        stock_item = next(
+                            (
+                                item
+                                for item in stock_by_part[part.pk]
+                                if item.quantity >= line.quantity
+                            ),
+                            None,
                         )
 
-                        part = line.matched_part
+                        if not stock_item:
+                            raise ValueError(
+                                f'{part.name}: insufficient stock in {self.location.name}. '
+                                f'Required: {line.quantity}'
+                            )
+
+                        # Reserve the stock for this line
+                        stock_item.quantity -= line.quantity
 
-                        # Ensure part is salable
-                        if not part.salable:
-                            part.salable = True
-                            part.save()
+                        allocated.append((line, stock_item))
 
-                        # Calculate unit price
-                        unit_price = line.product_amount
-                        if line.quantity > 1:
-                            unit_price = line.product_amount / line.quantity
+                    except Exception as e:
+                        errors.append(f'Line {line.row_number}: {e}')
+                        line_errors.append(
+                            f'Error processing line {line.row_number}: {e}'
+                        )
 
-                        # Create line item
-                        so_line = SalesOrderLineItem.objects.create(
+                self.log(*line_errors)
+
+                # Create one shipment per shipment date from the Amazon report
+                today = timezone.now().date()
+                line_dates = [
+                    line.shipment_date.date() if line.shipment_date else today
+                    for line, _stock_item in allocated
+                ]
+
+                SalesOrderShipment.objects.bulk_create(
+                    [
+                        SalesOrderShipment(
+                            order=so,
+                            reference=line_date.isoformat(),  # Use date as reference
+                            shipment_date=line_date,
+                        )
+                        for line_date in sorted(set(line_dates))
+                    ],
+                    ignore_conflicts=True,
+                )
+
+                # Read the shipments back (bulk_create does not set primary keys
+                # on every database backend, nor with ignore_conflicts)
+                shipments = {
+                    shipment.reference: shipment
+                    for shipment in SalesOrderShipment.objects.filter(order=so)
+                }
+
+                so_lines = SalesOrderLineItem.objects.bulk_create(
+                    [
+                        SalesOrderLineItem(
                             order=so,
-                            part=part,
+                            part=line.matched_part,
                             quantity=line.quantity,
-                            sale_price=unit_price,
+                            # Unit price
+                            sale_price=line.product_amount / line.quantity
+                            if line.quantity > 1
+                            else line.product_amount,
                             shipped=line.quantity,
                             target_date=line_date,
                         )
+                        for (line, _stock_item), line_date in zip(
+                            allocated, line_dates, strict=True
+                        )
+                    ],
+                    batch_size=1000,
+                )
 
-                        # Find stock item from required location
-                        if not self.location:
-                            raise ValueError('Stock Location is required to allocate stock items')
-                        
-                        stock_item = StockItem.objects.filter(
-                            part=part,
-                            location=self.location,
-                            quantity__gte=line.quantity
-                        ).first()
-
-                        if not stock_item:
-                            raise ValueError(
-                                f'{part.name}: insufficient stock in {self.location.name}. '
-                                f'Required: {line.quantity}'
-                            )
+                if so_lines and so_lines[0].pk is None:
+                    # Primary keys were not returned (e.g. MySQL),
+                    # but the line items were inserted in order
+                    so_lines = list(so.lines.order_by('pk'))
 
-                        # Create allocation
-                        SalesOrderAllocation.objects.create(
+                SalesOrderAllocation.objects.bulk_create(
+                    [
+                        SalesOrderAllocation(
                             line=so_line,
-                            shipment=shipment,
+                            shipment=shipments[line_date.isoformat()],
                             item=stock_item,
                             quantity=line.quantity,
                         )
+                        for (line, stock_item), so_line, line_date in zip(
+                            allocated, so_lines, line_dates, strict=True
+                        )
+                    ],
+                    batch_size=1000,
+                )
 
-                        # Reduce stock
-                        stock_item.quantity -= line.quantity
-                        stock_item.save()
+                # Reduce stock, with one (database side) UPDATE per stock item
+                deductions = defaultdict(int)
 
-                        line.sales_order = so
-                        line.save()
-                        lines_processed += 1
+                for line, stock_item in allocated:
+                    deductions[stock_item.pk] += line.quantity
 
-                    except Exception as e:
-                        errors.append(f'Line {line.row_number}: {e}')
-                        self.log(f'Error processing line {line.row_number}: {e}')
+                # (only while enough stock remains, in case it changed meanwhile)
+                for stock_item_id, quantity in deductions.items():
+                    updated = StockItem.objects.filter(
+                        pk=stock_item_id, quantity__gte=quantity
+                    ).update(quantity=F('quantity') - quantity)
+
+                    if updated != 1:
+                        raise ValueError(
+                            f'Stock item {stock_item_id} no longer has {quantity} '
+                            f'available in {self.location.name}'
+                        )
+
+                for line, _stock_item in allocated:
+                    line.sales_order = so
+
+                AmazonSalesReportLine.objects.bulk_update(
+                    [line for line, _stock_item in allocated],
+                    ['sales_order'],
+                    batch_size=1000,
+                )
+
+                lines_processed = len(allocated)
 
                 # Mark SO as shipped
                 so.status = SalesOrderStatus.SHIPPED.value
@@ -413,11 +732,15 @@ class AmazonSalesReport(models.Model):
             errors.append(str(e))
             self.log(f'Error: {e}')
             self.status = AmazonSalesReportStatus.ERROR
-            self.save()
+            self.save(update_fields=['status'])
             return 0, 0, errors
 
         self.status = AmazonSalesReportStatus.COMPLETED
-        self.save()
+        self.save(update_fields=['status', 'orders_created'])
+
+        schedule_part_stock_updates({
+            stock_item.part_id for _line, stock_item in allocated
+        })
 
         return 1, lines_processed, errors
 
@@ -458,8 +781,8 @@ class AmazonSalesReportLine(models.Model):
     )
 
     # Amazon data fields
-    shipment_date = models.CharField(
-        max_length=50, blank=True, verbose_name=_('Shipment Date')
+    shipment_date = models.DateTimeField(
+        null=True, blank=True, db_index=True, verbose_name=_('Shipment Date')
     )
 
     merchant_sku = models.CharField(
@@ -535,13 +858,10 @@ class AmazonSalesReportLine(models.Model):
         if not self.matched_part or not self.asin:
             return False
 
-        template, _ = PartParameterTemplate.objects.get_or_create(
-            name='ASIN',
-            defaults={'description': 'Amazon Standard Identification Number'},
-        )
-
         param, created = PartParameter.objects.get_or_create(
-            part=self.matched_part, template=template, defaults={'data': self.asin}
+            part=self.matched_part,
+            template=asin_template(),
+            defaults={'data': self.asin},
         )
 
         if not created and param.data != self.asin:
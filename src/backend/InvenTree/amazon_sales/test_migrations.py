@@ -0,0 +1,86 @@
+"""Unit tests for the 'amazon_sales' data migrations."""
+
+from datetime import UTC, datetime
+
+from django_test_migrations.contrib.unittest_case import MigratorTestCase
+
+
+class TestShipmentDateMigration(MigratorTestCase):
+    """Test conversion of the shipment date strings into datetime values."""
+
+    migrate_from = ('amazon_sales', '0002_amazonsalesreport_location')
+    migrate_to = ('amazon_sales', '0003_amazonsalesreportline_shipment_datetime')
+
+    def prepare(self):
+        """Create report lines with valid, empty and invalid shipment dates."""
+        AmazonSalesReport = self.old_state.apps.get_model(
+            'amazon_sales', 'amazonsalesreport'
+        )
+        AmazonSalesReportLine = self.old_state.apps.get_model(
+            'amazon_sales', 'amazonsalesreportline'
+        )
+
+        report = AmazonSalesReport.objects.create(name='Test', csv_file='report.csv')
+
+        for row, value in enumerate([
+            '2024-07-01T10:30:00+00:00',
+            '2024-07-02T08:00:00Z',
+            '',
+            'not a date',
+        ]):
+            AmazonSalesReportLine.objects.create(
+                report=report, row_number=row, shipment_date=value
+            )
+
+    def test_migration(self):
+        """Valid dates are converted, empty and invalid dates are dropped."""
+        AmazonSalesReportLine = self.new_state.apps.get_model(
+            'amazon_sales', 'amazonsalesreportline'
+        )
+
+        dates = dict(
+            AmazonSalesReportLine.objects.values_list('row_number', 'shipment_date')
+        )
+
+        self.assertEqual(dates[0], datetime(2024, 7, 1, 10, 30, tzinfo=UTC))
+        self.assertEqual(dates[1], datetime(2024, 7, 2, 8, 0, tzinfo=UTC))
+        self.assertIsNone(dates[2])
+        self.assertIsNone(dates[3])
+
+
+class TestShipmentDateReverseMigration(MigratorTestCase):
+    """Test reversing the conversion of the shipment dates."""
+
+    migrate_from = ('amazon_sales', '0003_amazonsalesreportline_shipment_datetime')
+    migrate_to = ('amazon_sales', '0002_amazonsalesreport_location')
+
+    def prepare(self):
+        """Create report lines with and without a shipment date."""
+        AmazonSalesReport = self.old_state.apps.get_model(
+            'amazon_sales', 'amazonsalesreport'
+        )
+        AmazonSalesReportLine = self.old_state.apps.get_model(
+            'amazon_sales', 'amazonsalesreportline'
+        )
+
+        report = AmazonSalesReport.objects.create(name='Test', csv_file='report.csv')
+
+        AmazonSalesReportLine.objects.create(
+            report=report,
+            row_number=0,
+            shipment_date=datetime(2024, 7, 1, 10, 30, tzinfo=UTC),
+        )
+        AmazonSalesReportLine.objects.create(report=report, row_number=1)
+
+    def test_migration(self):
+        """Dates are written back as ISO 8601 strings."""
+        AmazonSalesReportLine = self.new_state.apps.get_model(
+            'amazon_sales', 'amazonsalesreportline'
+        )
+
+        dates = dict(
+            AmazonSalesReportLine.objects.values_list('row_number', 'shipment_date')
+        )
+
+        self.assertEqual(dates[0], '2024-07-01T10:30:00+00:00')
+        self.assertEqual(dates[1], '')
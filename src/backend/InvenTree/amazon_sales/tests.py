@@ -0,0 +1,365 @@
+"""Unit tests for the 'amazon_sales' app."""
+
+import csv
+import io
+from datetime import UTC, date, datetime
+from decimal import Decimal
+
+from django.core.files.base import ContentFile
+
+from amazon_sales.models import (
+    REPORT_COLUMNS,
+    AmazonSalesReport,
+    AmazonSalesReportLine,
+    AmazonSalesReportStatus,
+    asin_template,
+)
+from InvenTree.unit_test import InvenTreeTestCase
+from order.models import SalesOrder, SalesOrderAllocation
+from order.status_codes import SalesOrderStatus
+from part.models import Part, PartParameter
+from stock.models import StockItem, StockLocation
+
+
+class AmazonSalesReportTestMixin:
+    """Helpers for Amazon sales report tests."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create the parts (with ASINs) and the stock location."""
+        super().setUpTestData()
+
+        cls.location = StockLocation.objects.create(name='Amazon Stock')
+
+        cls.widget = Part.objects.create(
+            name='Widget', description='A widget', salable=False
+        )
+        cls.gadget = Part.objects.create(
+            name='Gadget', description='A gadget', salable=True
+        )
+
+        template = asin_template()
+
+        PartParameter.objects.create(
+            part=cls.widget, template=template, data='B0WIDGET01'
+        )
+        PartParameter.objects.create(
+            part=cls.gadget, template=template, data='B0GADGET01'
+        )
+
+    def create_report(self, rows: list[dict], **kwargs) -> AmazonSalesReport:
+        """Create a report from a list of rows (each a dict of column values)."""
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=list(REPORT_COLUMNS))
+        writer.writeheader()
+
+        for row in rows:
+            writer.writerow({**REPORT_COLUMNS, **row})
+
+        kwargs.setdefault('location', self.location)
+
+        return AmazonSalesReport.objects.create(
+            name='Test Report',
+            csv_file=ContentFile(output.getvalue().encode(), 'report.csv'),
+            **kwargs,
+        )
+
+    @staticmethod
+    def row(asin: str, quantity: int = 1, **kwargs) -> dict:
+        """Return the column values for a report row."""
+        return {
+            'Customer Shipment Date': '2024-07-01T10:30:00+00:00',
+            'ASIN': asin,
+            'Quantity': str(quantity),
+            'Product Amount': '10.00',
+            'FC': 'LBA1',
+            **kwargs,
+        }
+
+    def prepare_report(self, rows: list[dict]) -> AmazonSalesReport:
+        """Create, parse and match a report."""
+        report = self.create_report(rows)
+        report.parse_csv()
+        report.match_asins()
+
+        return report
+
+
+class AmazonSalesReportParseTest(AmazonSalesReportTestMixin, InvenTreeTestCase):
+    """Tests for parsing and matching Amazon sales reports."""
+
+    def test_parse_csv(self):
+        """Valid rows are imported, and invalid rows are reported."""
+        report = self.create_report([
+            self.row('B0WIDGET01', 2, **{'Amazon Order Id': '202-1'}),
+            self.row(
+                'B0GADGET01', **{'Customer Shipment Date': '2024-07-05T08:00:00Z'}
+            ),
+            # Invalid date (the line is kept, without a date)
+            self.row('B0WIDGET01', **{'Customer Shipment Date': 'yesterday'}),
+            # Invalid quantity
+            self.row('B0WIDGET01', Quantity='two'),
+            # Values which do not fit their columns
+            self.row('B0WIDGET01', FC='FULFILMENT-CENTRE'),
+            self.row('B0WIDGET01', Currency='POUNDS'),
+            self.row('B0WIDGET01', **{'Product Amount': '123456789.00'}),
+            self.row('B0WIDGET01', **{'Shipping Amount': '1.005'}),
+        ])
+
+        count, error = report.parse_csv()
+
+        self.assertEqual(error, '')
+        self.assertEqual(count, 3)
+
+        report.refresh_from_db()
+
+        self.assertEqual(report.status, AmazonSalesReportStatus.PARSED)
+        self.assertEqual(report.total_lines, 3)
+        self.assertEqual(report.unmatched_lines, 3)
+        self.assertEqual(report.date_from, date(2024, 7, 1))
+        self.assertEqual(report.date_to, date(2024, 7, 5))
+
+        lines = list(report.lines.all())
+
+        self.assertEqual([line.row_number for line in lines], [2, 3, 4])
+        self.assertEqual(
+            lines[0].shipment_date, datetime(2024, 7, 1, 10, 30, tzinfo=UTC)
+        )
+        self.assertEqual(lines[0].quantity, 2)
+        self.assertEqual(lines[0].amazon_order_id, '202-1')
+        self.assertEqual(lines[0].product_amount, Decimal('10.00'))
+        self.assertEqual(lines[0].currency, 'GBP')
+        self.assertIsNone(lines[2].shipment_date)
+
+        self.assertIn('Row 4: Invalid shipment date "yesterday"', report.notes)
+        self.assertIn('Row 5: Error parsing', report.notes)
+
+        for row_num, field in [
+            (6, 'fulfillment_center'),
+            (7, 'currency'),
+            (8, 'product_amount'),
+            (9, 'shipping_amount'),
+        ]:
+            self.assertIn(f'Row {row_num}: Invalid value - {field}:', report.notes)
+
+    def test_parse_csv_repeated(self):
+        """Parsing a report again replaces its lines."""
+        report = self.create_report([self.row('B0WIDGET01'), self.row('B0GADGET01')])
+
+        self.assertEqual(report.parse_csv(), (2, ''))
+        report.match_asins()
+
+        self.assertEqual(report.parse_csv(), (2, ''))
+
+        report.refresh_from_db()
+
+        self.assertEqual(report.lines.count(), 2)
+        self.assertEqual(report.total_lines, 2)
+        self.assertEqual(report.matched_lines, 0)
+        self.assertFalse(report.lines.exclude(matched_part=None).exists())
+
+    def test_match_asins(self):
+        """Lines are matched to parts by their ASIN parameter."""
+        report = self.create_report([
+            self.row('B0WIDGET01'),
+            self.row('B0GADGET01'),
+            self.row('B0UNKNOWN1'),
+            self.row(''),
+        ])
+        report.parse_csv()
+
+        # Matching is repeatable
+        for _ in range(2):
+            self.assertEqual(report.match_asins(), (2, 2))
+
+        lines = list(report.lines.all())
+
+        self.assertEqual(lines[0].matched_part, self.widget)
+        self.assertEqual(lines[1].matched_part, self.gadget)
+        self.assertIsNone(lines[2].matched_part)
+        self.assertIsNone(lines[3].matched_part)
+
+        self.assertEqual(
+            [line.match_status for line in lines],
+            [
+                AmazonSalesReportLine.MATCH_AUTO,
+                AmazonSalesReportLine.MATCH_AUTO,
+                AmazonSalesReportLine.MATCH_NOT_FOUND,
+                AmazonSalesReportLine.MATCH_NO_ASIN,
+            ],
+        )
+
+        self.assertFalse(report.check_ready())
+
+        # Assign the unknown ASIN to a (new) part manually, and match again
+        gizmo = Part.objects.create(name='Gizmo', description='A gizmo')
+
+        lines[2].matched_part = gizmo
+        self.assertTrue(lines[2].assign_asin_to_part())
+
+        self.assertEqual(
+            PartParameter.objects.get(part=gizmo, template=asin_template()).data,
+            'B0UNKNOWN1',
+        )
+
+        self.assertEqual(report.match_asins(), (3, 1))
+
+
+class AmazonSalesOrderTest(AmazonSalesReportTestMixin, InvenTreeTestCase):
+    """Tests for creating sales orders from Amazon sales reports."""
+
+    def setUp(self):
+        """Create the stock for each test."""
+        super().setUp()
+
+        self.widget_stock = StockItem.objects.create(
+            part=self.widget, quantity=10, location=self.location
+        )
+        self.gadget_stock = StockItem.objects.create(
+            part=self.gadget, quantity=5, location=self.location
+        )
+
+    def test_create_sales_orders(self):
+        """A shipped sales order is created, with the stock allocated and deducted."""
+        report = self.prepare_report([
+            self.row('B0WIDGET01', 2),
+            self.row('B0WIDGET01', 3, **{'Product Amount': '30.00'}),
+            self.row(
+                'B0GADGET01', 1, **{'Customer Shipment Date': '2024-07-02T09:00:00Z'}
+            ),
+        ])
+
+        self.assertTrue(report.check_ready())
+
+        orders, lines, errors = report.create_sales_orders()
+
+        self.assertEqual((orders, lines, errors), (1, 3, []))
+
+        report.refresh_from_db()
+
+        self.assertEqual(report.status, AmazonSalesReportStatus.COMPLETED)
+        self.assertEqual(report.orders_created, 1)
+
+        so = SalesOrder.objects.get(customer_reference__startswith='AMZ-')
+
+        self.assertEqual(so.status, SalesOrderStatus.SHIPPED.value)
+        self.assertEqual(so.customer.name, 'Amazon UK')
+        self.assertEqual(so.lines.count(), 3)
+
+        # One shipment per shipment date
+        self.assertEqual(
+            sorted(so.shipments.values_list('reference', flat=True)),
+            ['2024-07-01', '2024-07-02'],
+        )
+
+        # Unit price is taken from the product amount
+        self.assertEqual(so.lines.get(quantity=3).sale_price.amount, Decimal('10.00'))
+
+        allocations = SalesOrderAllocation.objects.filter(line__order=so)
+
+        self.assertEqual(allocations.count(), 3)
+        self.assertEqual(
+            sorted(allocations.values_list('item', 'quantity')),
+            sorted([
+                (self.widget_stock.pk, 2),
+                (self.widget_stock.pk, 3),
+                (self.gadget_stock.pk, 1),
+            ]),
+        )
+
+        # Stock is deducted
+        self.widget_stock.refresh_from_db()
+        self.gadget_stock.refresh_from_db()
+
+        self.assertEqual(self.widget_stock.quantity, 5)
+        self.assertEqual(self.gadget_stock.quantity, 4)
+
+        # Every line is linked to the sales order, and the parts are salable
+        self.assertFalse(report.lines.exclude(sales_order=so).exists())
+
+        self.widget.refresh_from_db()
+        self.assertTrue(self.widget.salable)
+
+    def test_partial_allocation(self):
+        """Lines which cannot be allocated from a single stock item are reported."""
+        self.widget_stock.quantity = 3
+        self.widget_stock.save()
+
+        StockItem.objects.create(part=self.widget, quantity=3, location=self.location)
+
+        report = self.prepare_report([
+            self.row('B0WIDGET01', 2),
+            self.row('B0WIDGET01', 2),
+            self.row('B0WIDGET01', 2),
+        ])
+
+        orders, lines, errors = report.create_sales_orders()
+
+        self.assertEqual((orders, lines), (1, 2))
+        self.assertEqual(len(errors), 1)
+        self.assertIn('Line 4: Widget: insufficient stock', errors[0])
+
+        report.refresh_from_db()
+
+        self.assertEqual(report.status, AmazonSalesReportStatus.COMPLETED)
+        self.assertEqual(report.lines.exclude(sales_order=None).count(), 2)
+
+        self.assertEqual(
+            sorted(
+                StockItem.objects.filter(part=self.widget).values_list(
+                    'quantity', flat=True
+                )
+            ),
+            [1, 1],
+        )
+
+    def test_insufficient_stock(self):
+        """Nothing is written if there is not enough stock for every part."""
+        n_orders = SalesOrder.objects.count()
+
+        report = self.prepare_report([
+            self.row('B0WIDGET01', 2),
+            self.row('B0GADGET01', 6),
+        ])
+
+        orders, lines, errors = report.create_sales_orders()
+
+        self.assertEqual((orders, lines), (0, 0))
+        self.assertEqual(len(errors), 1)
+        self.assertIn('Insufficient stock in Amazon Stock: Gadget', errors[0])
+
+        report.refresh_from_db()
+
+        self.assertEqual(report.status, AmazonSalesReportStatus.ERROR)
+        self.assertIn('Error: Insufficient stock', report.notes)
+
+        self.assertEqual(SalesOrder.objects.count(), n_orders)
+        self.assertFalse(report.lines.exclude(sales_order=None).exists())
+
+        self.widget_stock.refresh_from_db()
+        self.assertEqual(self.widget_stock.quantity, 10)
+
+    def test_no_location(self):
+        """A stock location is required to create the sales orders."""
+        report = self.prepare_report([self.row('B0WIDGET01')])
+        report.location = None
+        report.save()
+
+        orders, lines, errors = report.create_sales_orders()
+
+        self.assertEqual((orders, lines), (0, 0))
+        self.assertIn('Stock Location is required', errors[0])
+
+        report.refresh_from_db()
+        self.assertEqual(report.status, AmazonSalesReportStatus.ERROR)
+
+    def test_unmatched_lines(self):
+        """Unmatched lines are left out of the sales order."""
+        report = self.prepare_report([self.row('B0WIDGET01'), self.row('B0UNKNOWN1')])
+
+        self.assertEqual(report.create_sales_orders(), (1, 1, []))
+
+        self.assertEqual(report.lines.filter(sales_order=None).count(), 1)
+
+        self.widget_stock.refresh_from_db()
+        self.assertEqual(self.widget_stock.quantity, 9)
@@ -1,14 +1,108 @@
 """Admin for the common app."""
 
-import json
 import os
-import subprocess
+import threading
+from datetime import datetime
 
+from django import forms
 from django.contrib import admin, messages
 from django.http import HttpResponseRedirect
+from django.shortcuts import render
 from django.urls import path
 
 from . import models, validators
+from .backup_utils import (
+    backup_dir,
+    create_backup,
+    is_backup_file,
+    load_backup_metadata,
+    restore_backup,
+)
+
+# Cached backup file choices, keyed by the modification time of the backup
+# directory (and of the metadata file), so that the directory is only
+# re-scanned when it changes
+_BACKUP_LIST_LOCK = threading.Lock()
+_BACKUP_LIST_CACHE = {'key': None, 'entries': []}
+
+
+def get_backup_choices(directory: str) -> list[tuple[str, str]]:
+    """Return the (filename, label) choices for the backup files in directory.
+
+    Files are sorted newest first (by name), and labelled with their size
+    and custom name (from the metadata file).
+    """
+    metadata_file = os.path.join(directory, 'backup_metadata.json')
+
+    try:
+        dir_mtime = os.stat(directory).st_mtime_ns
+    except OSError:
+        return []
+
+    try:
+        meta_mtime = os.stat(metadata_file).st_mtime_ns
+    except OSError:
+        meta_mtime = None
+
+    key = (directory, dir_mtime, meta_mtime)
+
+    with _BACKUP_LIST_LOCK:
+        if _BACKUP_LIST_CACHE['key'] == key:
+            return _BACKUP_LIST_CACHE['entries']
+
+        metadata = load_backup_metadata(metadata_file)
+
+        entries = []
+
+        with os.scandir(directory) as it:
+            for entry in sorted(it, key=lambda e: e.name, reverse=True):
+                f = entry.name
+
+                # Include all PostgreSQL backup files
+                if not is_backup_file(f) or not entry.is_file():
+                    continue
+
+                size_mb = entry.stat().st_size / (1024 * 1024)
+
+                # Add custom name if exists in metadata
+                custom_name = metadata.get(f, {}).get('custom_name', '')
+                if custom_name:
+                    label = f'{f} ({size_mb:.2f} MB) - "{custom_name}"'
+                else:
+                    label = f'{f} ({size_mb:.2f} MB)'
+
+                entries.append((f, label))
+
+        _BACKUP_LIST_CACHE['key'] = key
+        _BACKUP_LIST_CACHE['entries'] = entries
+
+    return entries
+
+
+class BackupForm(forms.Form):
+    """Form for creating a database backup."""
+
+    backup_name = forms.CharField(
+        label='Backup Name / Comment',
+        max_length=100,
+        required=False,
+        widget=forms.TextInput(
+            attrs={
+                'style': 'width: 100%; padding: 15px; font-size: 16px; border: 2px solid #333; border-radius: 4px;',
+                'placeholder': 'e.g., before-update, monthly-backup, etc.',
+            }
+        ),
+    )
+
+
+class RestoreForm(forms.Form):
+    """Form for restoring a database backup (choices are set per request)."""
+
+    backup_file = forms.ChoiceField(
+        choices=[],
+        label='Select Backup File',
+        widget=forms.Select(attrs={'style': 'width: 100%; padding: 8px;'}),
+    )
 
 
 @admin.register(models.Attachment)
@@ -56,27 +150,22 @@ class AttachmentAdmin(admin.ModelAdmin):
         ]
         return custom_urls + urls
 
+    def run_backup_task(self, request, func, *args):
+        """Run a backup / restore function, and report the result.
+
+        Both run in the request: a backup may take up to INVOKE_TIMEOUT, which is
+        longer than the task lock (see max_task_timeout), so a background backup
+        could be started again on a second worker while the first is still running.
+        A restore replaces the database (including the task queue and the sessions),
+        so the result of a background restore could never be reported.
+        """
+        try:
+            messages.success(request, func(*args))
+        except Exception as e:
+            messages.error(request, f'❌ {e!s}')
+
     def backup_create_view(self, request):
         """View to create backup."""
-        from datetime import datetime
-
-        from django import forms
-        from django.shortcuts import render
-
-        class BackupForm(forms.Form):
-            backup_name = forms.CharField(
-                label='Backup Name / Comment',
-                max_length=100,
-                required=False,
-                initial=f'backup-{datetime.now().strftime("%Y%m%d-%H%M%S")}',
-                widget=forms.TextInput(
-                    attrs={
-                        'style': 'width: 100%; padding: 15px; font-size: 16px; border: 2px solid #333; border-radius: 4px;',
-                        'placeholder': 'e.g., before-update, monthly-backup, etc.',
-                    }
-                ),
-            )
-
         if request.method == 'POST':
             form = BackupForm(request.POST)
             if form.is_valid():
@@ -84,86 +173,20 @@ class AttachmentAdmin(admin.ModelAdmin):
                     form.cleaned_data['backup_name']
                     or f'backup-{datetime.now().strftime("%Y%m%d-%H%M%S")}'
                 )
-                try:
-                    cwd = os.environ.get('INVENTREE_ROOT', '/home/inventree')
-                    backup_dir = os.environ.get(
-                        'INVENTREE_BACKUP_DIR', '/home/inventree/dev/backup'
-                    )
-
-                    # Get list of existing backups before creating new one
-                    existing_backups = set()
-                    if os.path.exists(backup_dir):
-                        existing_backups = {
-                            f
-                            for f in os.listdir(backup_dir)
-                            if f.endswith('.psql.bin.gz')
-                        }
-
-                    result = subprocess.run(
-                        'invoke backup',
-                        check=False,
-                        cwd=cwd,
-                        shell=True,
-                        capture_output=True,
-                        text=True,
-                        timeout=3600,
-                    )
-
-                    if result.returncode == 0:
-                        # Find the newly created backup file
-                        if os.path.exists(backup_dir):
-                            new_backups = {
-                                f
-                                for f in os.listdir(backup_dir)
-                                if f.endswith('.psql.bin.gz')
-                            }
-                            new_files = new_backups - existing_backups
-
-                            if new_files:
-                                new_backup_file = list(new_files)[0]
-
-                                # Save metadata
-                                metadata_file = os.path.join(
-                                    backup_dir, 'backup_metadata.json'
-                                )
-                                metadata = {}
-                                if os.path.exists(metadata_file):
-                                    try:
-                                        with open(metadata_file, encoding='utf-8') as f:
-                                            metadata = json.load(f)
-                                    except:
-                                        metadata = {}
-
-                                metadata[new_backup_file] = {
-                                    'custom_name': backup_name,
-                                    'created_at': datetime.now().strftime(
-                                        '%Y-%m-%d %H:%M:%S'
-                                    ),
-                                }
-
-                                with open(metadata_file, 'w', encoding='utf-8') as f:
-                                    json.dump(metadata, f, indent=2, ensure_ascii=False)
-
-                        messages.success(
-                            request, f'✅ Backup "{backup_name}" created successfully'
-                        )
-                    else:
-                        messages.error(request, f'❌ Backup failed: {result.stderr}')
-                except Exception as e:
-                    messages.error(request, f'❌ Backup error: {e!s}')
+                self.run_backup_task(request, create_backup, backup_name)
 
                 return HttpResponseRedirect('../')
         else:
-            form = BackupForm()
-
-        backup_dir = os.environ.get(
-            'INVENTREE_BACKUP_DIR', '/home/inventree/dev/backup'
-        )
+            form = BackupForm(
+                initial={
+                    'backup_name': f'backup-{datetime.now().strftime("%Y%m%d-%H%M%S")}'
+                }
+            )
 
         context = {
             'form': form,
             'title': 'Create Database Backup',
-            'backup_dir': backup_dir,
+            'backup_dir': backup_dir(),
             'site_header': 'InvenTree Admin',
             'has_permission': True,
         }
@@ -172,84 +195,28 @@ class AttachmentAdmin(admin.ModelAdmin):
 
     def backup_restore_view(self, request):
         """View to restore backup."""
-        from django import forms
-        from django.shortcuts import render
-
-        backup_dir = os.environ.get(
-            'INVENTREE_BACKUP_DIR', '/home/inventree/dev/backup'
-        )
-
-        # Load metadata
-        metadata = {}
-        metadata_file = os.path.join(backup_dir, 'backup_metadata.json')
-        if os.path.exists(metadata_file):
-            try:
-                with open(metadata_file, encoding='utf-8') as f:
-                    metadata = json.load(f)
-            except:
-                metadata = {}
+        directory = backup_dir()
 
         # Get list of backup files with metadata
-        db_backups = []
-        if os.path.exists(backup_dir):
-            for f in sorted(os.listdir(backup_dir), reverse=True):
-                # Include all PostgreSQL backup files
-                if f.endswith('.psql.bin.gz') or (
-                    f.startswith('InvenTree-db-') and f.endswith('.gz')
-                ):
-                    filepath = os.path.join(backup_dir, f)
-                    size_mb = os.path.getsize(filepath) / (1024 * 1024)
-
-                    # Add custom name if exists in metadata
-                    custom_name = metadata.get(f, {}).get('custom_name', '')
-                    if custom_name:
-                        label = f'{f} ({size_mb:.2f} MB) - "{custom_name}"'
-                    else:
-                        label = f'{f} ({size_mb:.2f} MB)'
-
-                    db_backups.append((f, label))
-
-        class RestoreForm(forms.Form):
-            backup_file = forms.ChoiceField(
-                choices=db_backups,
-                label='Select Backup File',
-                widget=forms.Select(attrs={'style': 'width: 100%; padding: 8px;'}),
-            )
+        db_backups = get_backup_choices(directory)
 
         if request.method == 'POST':
             form = RestoreForm(request.POST)
+            form.fields['backup_file'].choices = db_backups
             if form.is_valid():
-                selected_file = form.cleaned_data['backup_file']
-                try:
-                    cwd = os.environ.get('INVENTREE_ROOT', '/home/inventree')
-                    result = subprocess.run(
-                        f'invoke restore --db-file={selected_file}',
-                        check=False,
-                        cwd=cwd,
-                        shell=True,
-                        capture_output=True,
-                        text=True,
-                        timeout=3600,
-                    )
-
-                    if result.returncode == 0:
-                        messages.success(
-                            request,
-                            f'✅ Restore from {selected_file} completed successfully',
-                        )
-                    else:
-                        messages.error(request, f'❌ Restore failed: {result.stderr}')
-                except Exception as e:
-                    messages.error(request, f'❌ Restore error: {e!s}')
+                self.run_backup_task(
+                    request, restore_backup, form.cleaned_data['backup_file']
+                )
 
                 return HttpResponseRedirect('../')
         else:
             form = RestoreForm()
+            form.fields['backup_file'].choices = db_backups
 
         context = {
             'form': form,
             'title': 'Restore Database Backup',
-            'backup_dir': backup_dir,
+            'backup_dir': directory,
             'site_header': 'InvenTree Admin',
             'has_permission': True,
         }
@@ -258,24 +225,7 @@ class AttachmentAdmin(admin.ModelAdmin):
 
     def action_create_backup(self, request, queryset):
         """Action to create backup."""
-        try:
-            cwd = os.environ.get('INVENTREE_ROOT', '/home/inventree')
-            result = subprocess.run(
-                'invoke backup',
-                check=False,
-                cwd=cwd,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=3600,
-            )
-
-            if result.returncode == 0:
-                messages.success(request, '✅ Backup created successfully')
-            else:
-                messages.error(request, f'❌ Backup failed: {result.stderr}')
-        except Exception as e:
-            messages.error(request, f'❌ Backup error: {e!s}')
+        self.run_backup_task(request, create_backup)
 
     action_create_backup.short_description = '📦 Create Database Backup'
     action_create_backup.permissions = []
@@ -283,24 +233,7 @@ class AttachmentAdmin(admin.ModelAdmin):
 
     def action_restore_backup(self, request, queryset):
         """Action to restore from latest backup."""
-        try:
-            cwd = os.environ.get('INVENTREE_ROOT', '/home/inventree')
-            result = subprocess.run(
-                'invoke restore',
-                check=False,
-                cwd=cwd,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=3600,
-            )
-
-            if result.returncode == 0:
-                messages.success(request, '✅ Restore completed successfully')
-            else:
-                messages.error(request, f'❌ Restore failed: {result.stderr}')
-        except Exception as e:
-            messages.error(request, f'❌ Restore error: {e!s}')
+        self.run_backup_task(request, restore_backup)
 
     action_restore_backup.short_description = '📥 Restore from Latest Backup'
     action_restore_backup.permissions = []
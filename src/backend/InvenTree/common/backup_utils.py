@@ -0,0 +1,278 @@
+"""Helpers for running database backup / restore operations via invoke."""
+
+import json
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+
+import structlog
+
+logger = structlog.get_logger('inventree')
+
+# Maximum time (in seconds) allowed for a backup or restore
+INVOKE_TIMEOUT = 3600
+
+# Number of trailing output lines (and bytes) kept for error reporting
+INVOKE_OUTPUT_LINES = 200
+INVOKE_OUTPUT_BYTES = 4096
+
+# Cached contents of the backup metadata file, keyed by its modification time
+_METADATA_LOCK = threading.Lock()
+_METADATA_CACHE = {'key': None, 'data': {}}
+
+
+def invoke_cwd() -> str:
+    """Return the directory in which invoke commands are run."""
+    return os.environ.get('INVENTREE_ROOT', '/home/inventree')
+
+
+@dataclass
+class InvokeResult:
+    """Result of an invoke command.
+
+    Attributes:
+        returncode (int): Exit code of the command
+        stdout_tail (str): The last (up to 4 KiB) of standard output
+        stderr_tail (str): The last (up to 4 KiB) of standard error
+        duration_s (float): Run time of the command, in seconds
+    """
+
+    returncode: int
+    stdout_tail: str
+    stderr_tail: str
+    duration_s: float
+
+
+def _read_stream(stream, tail: deque, output: Callable[[str], None] | None, level: str):
+    """Read lines from a command output stream, keeping only the tail."""
+    for line in stream:
+        line = line.rstrip('\n')
+        tail.append(line)
+
+        if output:
+            output(line)
+        else:
+            getattr(logger, level)('invoke: %s', line)
+
+
+def _tail_text(tail: deque) -> str:
+    """Join the tail lines of a stream, limited to the last INVOKE_OUTPUT_BYTES."""
+    return '\n'.join(tail)[-INVOKE_OUTPUT_BYTES:]
+
+
+def run_invoke(
+    args: list[str],
+    timeout: int = INVOKE_TIMEOUT,
+    output: Callable[[str], None] | None = None,
+) -> InvokeResult:
+    """Run an invoke command, streaming its output line by line.
+
+    The output is passed to the output callback (or logged) as it is produced,
+    rather than being buffered in memory. Only the tail of each stream is kept.
+
+    Arguments:
+        args: The command to run (as a list of arguments, run without a shell)
+        timeout: Time (in seconds) after which the command is killed
+        output: Optional callback for each line of output (stdout and stderr)
+
+    Returns:
+        InvokeResult for the command
+
+    Raises:
+        subprocess.TimeoutExpired: If the command did not finish in time
+    """
+    stdout_tail = deque(maxlen=INVOKE_OUTPUT_LINES)
+    stderr_tail = deque(maxlen=INVOKE_OUTPUT_LINES)
+    expired = threading.Event()
+    start = time.monotonic()
+
+    with subprocess.Popen(
+        args,
+        cwd=invoke_cwd(),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        bufsize=1,
+    ) as proc:
+
+        def kill():
+            expired.set()
+            proc.kill()
+
+        timer = threading.Timer(timeout, kill)
+        timer.start()
+
+        # stderr is read in a separate thread, so that neither pipe can fill up
+        stderr_reader = threading.Thread(
+            target=_read_stream,
+            args=(proc.stderr, stderr_tail, output, 'warning'),
+            daemon=True,
+        )
+        stderr_reader.start()
+
+        try:
+            _read_stream(proc.stdout, stdout_tail, output, 'info')
+            stderr_reader.join()
+            proc.wait()
+        finally:
+            timer.cancel()
+
+    if expired.is_set():
+        raise subprocess.TimeoutExpired(
+            args,
+            timeout,
+            output=_tail_text(stdout_tail),
+            stderr=_tail_text(stderr_tail),
+        )
+
+    return InvokeResult(
+        returncode=proc.returncode,
+        stdout_tail=_tail_text(stdout_tail),
+        stderr_tail=_tail_text(stderr_tail),
+        duration_s=time.monotonic() - start,
+    )
+
+
+def backup_dir() -> str:
+    """Return the directory in which backup files are stored."""
+    return os.environ.get('INVENTREE_BACKUP_DIR', '/home/inventree/dev/backup')
+
+
+def load_backup_metadata(metadata_file: str) -> dict:
+    """Load the backup metadata file (mapping backup file name to custom name, etc).
+
+    The parsed data is cached until the file is modified,
+    so the returned dict must not be modified in place.
+    """
+    try:
+        mtime = os.stat(metadata_file).st_mtime_ns
+    except OSError:
+        return {}
+
+    key = (metadata_file, mtime)
+
+    with _METADATA_LOCK:
+        if _METADATA_CACHE['key'] != key:
+            try:
+                with open(metadata_file, encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(
+                    'Could not read backup metadata file %s: %s', metadata_file, e
+                )
+                data = {}
+
+            _METADATA_CACHE['key'] = key
+            _METADATA_CACHE['data'] = data
+
+        return _METADATA_CACHE['data']
+
+
+def save_backup_metadata(metadata_file: str, metadata: dict):
+    """Write the backup metadata file.
+
+    The data is written to a temporary file which then replaces the metadata
+    file, so that a failed write cannot leave a truncated file behind.
+    """
+    tmp_file = f'{metadata_file}.tmp'
+
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, ensure_ascii=False, separators=(',', ':'))
+
+    os.replace(tmp_file, metadata_file)
+
+
+def is_backup_file(name: str) -> bool:
+    """Return True if the file name is that of a (PostgreSQL) database backup."""
+    return name.endswith('.psql.bin.gz') or (
+        name.startswith('InvenTree-db-') and name.endswith('.gz')
+    )
+
+
+def backup_file_names(directory: str) -> set[str]:
+    """Return the names of the database backup files in a directory."""
+    with os.scandir(directory) as it:
+        return {
+            entry.name for entry in it if is_backup_file(entry.name) and entry.is_file()
+        }
+
+
+def create_backup(backup_name: str | None = None) -> str:
+    """Create a database backup (via 'invoke backup').
+
+    Runs either in the request, or as a background task.
+
+    Arguments:
+        backup_name: Optional custom name, recorded in the backup metadata file
+
+    Returns:
+        A success message
+
+    Raises:
+        RuntimeError: If the backup failed
+    """
+    directory = backup_dir()
+
+    # Get list of existing backups before creating new one
+    existing_backups = set()
+    if os.path.exists(directory):
+        existing_backups = backup_file_names(directory)
+
+    result = run_invoke(['invoke', 'backup'])
+
+    if result.returncode != 0:
+        raise RuntimeError(f'Backup failed: {result.stderr_tail}')
+
+    if not backup_name:
+        return '✅ Backup created successfully'
+
+    # Find the newly created backup file
+    if os.path.exists(directory):
+        if new_files := backup_file_names(directory) - existing_backups:
+            new_backup_file = list(new_files)[0]
+
+            # Save metadata
+            metadata_file = os.path.join(directory, 'backup_metadata.json')
+            metadata = dict(load_backup_metadata(metadata_file))
+
+            metadata[new_backup_file] = {
+                'custom_name': backup_name,
+                'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            }
+
+            save_backup_metadata(metadata_file, metadata)
+
+    return f'✅ Backup "{backup_name}" created successfully'
+
+
+def restore_backup(db_file: str | None = None) -> str:
+    """Restore a database backup (via 'invoke restore').
+
+    Arguments:
+        db_file: Backup file to restore (defaults to the latest backup)
+
+    Returns:
+        A success message
+
+    Raises:
+        RuntimeError: If the restore failed
+    """
+    args = ['invoke', 'restore']
+
+    if db_file:
+        args += ['--db-file', db_file]
+
+    result = run_invoke(args)
+
+    if result.returncode != 0:
+        raise RuntimeError(f'Restore failed: {result.stderr_tail}')
+
+    if db_file:
+        return f'✅ Restore from {db_file} completed successfully'
+
+    return '✅ Restore completed successfully'
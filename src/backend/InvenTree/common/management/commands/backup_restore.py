@@ -1,10 +1,12 @@
 """Management command for backup operations."""
 
-import os
+import shlex
 import subprocess
 
 from django.core.management.base import BaseCommand, CommandError
 
+from common.backup_utils import run_invoke
+
 
 class Command(BaseCommand):
     """Run backup or restore via invoke."""
@@ -41,52 +43,44 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         """Execute backup/restore command."""
         action = options['action']
-        cwd = os.environ.get('INVENTREE_ROOT', '/home/inventree')
 
         # Build invoke command
-        cmd = f'invoke {action}'
+        cmd = ['invoke', action]
 
         if options['path']:
-            cmd += f' --path={options["path"]}'
+            cmd += ['--path', options['path']]
 
         if action == 'restore':
             if options['db_file']:
-                cmd += f' --db-file={options["db_file"]}'
+                cmd += ['--db-file', options['db_file']]
             if options['media_file']:
-                cmd += f' --media-file={options["media_file"]}'
+                cmd += ['--media-file', options['media_file']]
 
         if options['skip_db']:
-            cmd += ' --skip-db'
+            cmd.append('--skip-db')
 
         if options['skip_media']:
-            cmd += ' --skip-media'
+            cmd.append('--skip-media')
 
         if action == 'backup':
             if options['encrypt']:
-                cmd += ' --encrypt'
+                cmd.append('--encrypt')
             if options['compress']:
-                cmd += ' --compress'
+                cmd.append('--compress')
 
         try:
-            self.stdout.write(f'Running: {cmd}')
-            result = subprocess.run(
-                cmd,
-                check=False,
-                cwd=cwd,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=3600,
-            )
+            self.stdout.write(f'Running: {shlex.join(cmd)}')
+            result = run_invoke(cmd, output=self.stdout.write)
 
             if result.returncode == 0:
                 self.stdout.write(
-                    self.style.SUCCESS(f'✅ {action.title()} completed successfully')
+                    self.style.SUCCESS(
+                        f'✅ {action.title()} completed successfully '
+                        f'({result.duration_s:.0f}s)'
+                    )
                 )
-                if result.stdout:
-                    self.stdout.write(result.stdout)
             else:
-                raise CommandError(f'❌ {action.title()} failed:\n{result.stderr}')
+                raise CommandError(f'❌ {action.title()} failed:\n{result.stderr_tail}')
         except subprocess.TimeoutExpired:
             raise CommandError(f'{action.title()} timed out after 1 hour')
         except Exception as e:
@@ -1,14 +1,11 @@
 """Admin site specification for the 'importer' app."""
 
-import logging
-
 from django.contrib import admin, messages
 
 import importer.models
 import importer.registry
-from importer.import_supplier_products import SupplierProductImporter
-
-logger = logging.getLogger(__name__)
+import importer.tasks
+from InvenTree.tasks import max_task_timeout, offload_task
 
 
 class DataImportColumnMapAdmin(admin.TabularInline):
@@ -95,69 +92,26 @@ def import_supplier_products_action(modeladmin, request, queryset):
         )
         return
 
-    try:
-        # Update status
-        session.status = (
-            importer.models.SupplierProductImportSession.StatusChoices.IN_PROGRESS
-        )
-        session.save()
-
-        # Read CSV file
-        session.data_file.open('rb')
-        csv_content = session.data_file.read().decode('utf-8')
-        session.data_file.close()
-
-        # Save to temp file for importer
-        import tempfile
-
-        with tempfile.NamedTemporaryFile(
-            mode='w', suffix='.csv', delete=False, encoding='utf-8'
-        ) as tmp:
-            tmp.write(csv_content)
-            tmp_path = tmp.name
-
-        # Run import
-        product_importer = SupplierProductImporter(verbose=True)
-        result = product_importer.import_all([(tmp_path, session.supplier.name)])
-
-        # Update session with results
-        session.parts_created = result['created_parts']
-        session.supplier_parts_created = result['created_supplier_parts']
-        session.errors = result.get('errors', [])
-        session.status = (
-            importer.models.SupplierProductImportSession.StatusChoices.COMPLETED
-        )
-
-        # Save full import log
-        session.import_log = product_importer.get_log()
-        session.save()
-
-        # Clean up temp file
-        import os
-
-        try:
-            os.unlink(tmp_path)
-        except:
-            pass
-
-        modeladmin.message_user(
-            request,
-            f'✅ Import completed!\n'
-            f'• Parts created: {result["created_parts"]}\n'
-            f'• Supplier parts created: {result["created_supplier_parts"]}',
-            messages.SUCCESS,
-        )
-
-    except Exception as e:
-        session.status = (
-            importer.models.SupplierProductImportSession.StatusChoices.FAILED
-        )
-        session.errors = [str(e)]
-        session.import_log = f'❌ Import failed: {e!s}'
-        session.save()
+    # Update status
+    session.status = (
+        importer.models.SupplierProductImportSession.StatusChoices.IN_PROGRESS
+    )
+    session.save()
+
+    # Run the import in the background (if a worker is available)
+    # (with a timeout which stays within the broker's task lock)
+    offload_task(
+        importer.tasks.run_supplier_import,
+        session.pk,
+        group='importer',
+        timeout=max_task_timeout(),
+    )
 
-        logger.error(f'Supplier product import failed: {e!s}', exc_info=True)
-        modeladmin.message_user(request, f'❌ Import failed: {e!s}', messages.ERROR)
+    modeladmin.message_user(
+        request,
+        '⏳ Import queued - refresh the import session for the results.',
+        messages.INFO,
+    )
 
 
 import_supplier_products_action.short_description = 'Import supplier products from CSV'
@@ -185,12 +139,22 @@ class SupplierProductImportSessionAdmin(admin.ModelAdmin):
         'import_log',
         'timestamp',
         'updated',
+        'started',
     ]
 
     fieldsets = (
         (
             'Basic Information',
-            {'fields': ('supplier', 'status', 'timestamp', 'updated', 'user')},
+            {
+                'fields': (
+                    'supplier',
+                    'status',
+                    'timestamp',
+                    'updated',
+                    'started',
+                    'user',
+                )
+            },
         ),
         ('CSV File', {'fields': ('data_file',)}),
         (
@@ -207,6 +171,16 @@ class SupplierProductImportSessionAdmin(admin.ModelAdmin):
         ),
     )
 
+    def changelist_view(self, request, extra_context=None):
+        """Mark imports which can no longer finish as failed, before listing them."""
+        importer.tasks.fail_stale_supplier_imports()
+        return super().changelist_view(request, extra_context)
+
+    def change_view(self, request, object_id, form_url='', extra_context=None):
+        """Mark imports which can no longer finish as failed, before showing one."""
+        importer.tasks.fail_stale_supplier_imports()
+        return super().change_view(request, object_id, form_url, extra_context)
+
     def get_readonly_fields(self, request, obj=None):
         """Make data_file readonly after upload."""
         fields = list(self.readonly_fields)
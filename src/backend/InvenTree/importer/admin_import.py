@@ -54,6 +54,7 @@ class SupplierProductImporterAdmin(admin.ModelAdmin):
                 try:
                     # Save uploaded files temporarily
                     import os
+                    import shutil
                     import tempfile
 
                     with tempfile.TemporaryDirectory() as tmpdir:
@@ -65,15 +66,16 @@ class SupplierProductImporterAdmin(admin.ModelAdmin):
                             ('connect_beauty_csv', 'connect_beauty_supplier'),
                             ('shure_csv', 'shure_supplier'),
                         ]:
-                            if field in request.FILES:
-                                file_content = request.FILES[field].read()
-                                filepath = os.path.join(
-                                    tmpdir, request.FILES[field].name
-                                )
-                                with open(filepath, 'wb') as f:
-                                    f.write(file_content)
-                                supplier_name = form.cleaned_data[supplier_field]
-                                csv_files.append((filepath, supplier_name))
+                            upload = request.FILES.get(field)
+                            if not upload:
+                                continue
+
+                            # Stream the upload to disk in chunks
+                            filepath = os.path.join(tmpdir, upload.name)
+                            with open(filepath, 'wb') as f:
+                                shutil.copyfileobj(upload, f, length=64 * 1024)
+                            supplier_name = form.cleaned_data[supplier_field]
+                            csv_files.append((filepath, supplier_name))
 
                         # Run import
                         importer = SupplierProductImporter(verbose=True)
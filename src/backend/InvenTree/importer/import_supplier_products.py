@@ -5,47 +5,151 @@ Automatically creates Parts and links them as SupplierParts to multiple supplier
 
 import csv
 import hashlib
+import itertools
 import logging
-from decimal import Decimal
-from typing import Optional
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import NamedTuple, Optional
 
 from django.core.management.base import CommandError
+from django.db import transaction
 
 from company.models import Company, SupplierPart
 from part.models import Part, PartCategory
 
 logger = logging.getLogger(__name__)
 
+# Buffer size (in bytes) used when reading CSV files
+CSV_BUFFER_SIZE = 1 << 20
+
+# Translation table which strips currency symbols from prices
+CURRENCY_SYMBOLS = str.maketrans('', '', '£€')
+
+
+class ProductRow(NamedTuple):
+    """A product read from a supplier CSV file, with normalized columns."""
+
+    sku: str
+    name: str
+    brand: str
+    barcode: str
+    category: str
+    price: str
+
+
+@dataclass(slots=True)
+class SupplierInfo:
+    """Supplier specific information for a product.
+
+    Attributes:
+        sku (str): The SKU of the product for this supplier
+        price_text (str): The unit price, as read from the CSV file
+        barcode (str): The product barcode
+        currency (str): The currency of the price
+    """
+
+    sku: str
+    price_text: str
+    barcode: str = ''
+    currency: str = 'GBP'
+
+
+@dataclass(slots=True)
+class ProductRecord:
+    """A product (deduplicated by SKU) across all supplier CSV files.
+
+    Attributes:
+        sku (str): The product SKU
+        name (str): The product name
+        brand (str): The product brand
+        category (str): The name of the product category
+        category_obj (Optional[PartCategory]): The matching PartCategory, if any
+        barcode (str): The product barcode
+        suppliers (dict[str, SupplierInfo]): Supplier information, keyed by supplier name
+    """
+
+    sku: str
+    name: str
+    brand: str
+    category: str
+    category_obj: Optional[PartCategory]
+    barcode: str
+    suppliers: dict[str, SupplierInfo] = field(default_factory=dict)
+
+
+def _column_getter(header: list[str], *names: str) -> Callable[[list[str]], str]:
+    """Return a function which reads a value from a CSV row.
+
+    The value is taken from the first of the named columns which is non-empty.
+    Column positions are looked up once, from the header row.
+    """
+    columns = {name: idx for idx, name in enumerate(header)}
+    indexes = [columns[name] for name in names if name in columns]
+
+    # Most files have only one of the named columns, so avoid the loop there
+    if not indexes:
+        return lambda row: ''
+
+    if len(indexes) == 1:
+        index = indexes[0]
+        return lambda row: row[index] if index < len(row) else ''
+
+    def get(row: list[str]) -> str:
+        for idx in indexes:
+            if idx < len(row) and row[idx]:
+                return row[idx]
+        return ''
+
+    return get
+
 
 class SupplierProductImporter:
     """Importer for supplier products with deduplication by barcode."""
 
-    def __init__(self, verbose=False):
-        """Initialize importer."""
+    # Number of rows written per bulk INSERT
+    BATCH_SIZE = 1000
+
+    def __init__(self, verbose=False, supplier_map: Optional[dict] = None):
+        """Initialize importer.
+
+        Args:
+            verbose: Log progress messages
+            supplier_map: Optional pre-fetched mapping of supplier name -> Company
+        """
         self.verbose = verbose
+        self.supplier_map: dict[str, Company] = dict(supplier_map or {})
+        self.category_map: dict[str, PartCategory] = {}
         self.products_by_barcode: dict[str, dict] = {}  # barcode -> product data
-        self.files_data = []  # List of (filename, supplier_name, data)
+        self.files_loaded = 0  # Number of CSV files read successfully
         self.created_parts = []
         self.created_supplier_parts = []
+        self.pending_supplier_parts = []  # Queued for bulk creation
+        # (part_id, supplier_id, SKU) of existing SupplierParts
+        self.existing_supplier_parts: set[tuple[int, int, str]] = set()
         self.errors = []
         self.log_messages = []  # Collect all log messages
-        self.used_ipns = set()  # Track IPNs used in this session
+        self.existing_ipns: set[str] = set()  # IPNs of all Parts in the database
 
     def log(self, msg):
-        """Log message if verbose."""
+        """Collect a log message, and output it if verbose."""
         self.log_messages.append(msg)
         if self.verbose:
             logger.info(msg)
-        print(msg)
+            print(msg)
 
     def get_log(self) -> str:
         """Get all collected log messages as a string."""
         return '\n'.join(self.log_messages)
 
-    def load_csv_file(self, filepath: str, supplier_name: str) -> list[dict]:
-        """Load CSV file and return list of product dictionaries.
+    def load_csv_file(self, filepath: str) -> Iterator[ProductRow]:
+        """Load CSV file, yielding products.
 
         Automatically detects column positions and format (Very vs standard).
+        Rows are read as they are consumed, rather than being held in memory.
+
+        Yields:
+            ProductRow for each product in the file
         """
         self.log(f'\n📂 Loading file: {filepath}')
 
@@ -67,107 +171,156 @@ class SupplierProductImporter:
             else:
                 products = self._load_standard_csv(filepath)
 
-            self.log(f'   ✓ Found {len(products)} products')
-            self.files_data.append((filepath, supplier_name, products))
-            return products
+            count = 0
+            for product in products:
+                count += 1
+                yield product
+
+            self.log(f'   ✓ Found {count} products')
+            self.files_loaded += 1
 
         except Exception as e:
             error_msg = f'Error loading {filepath}: {e!s}'
             self.errors.append(error_msg)
             self.log(f'   ✗ {error_msg}')
-            return []
 
-    def _load_standard_csv(self, filepath: str) -> list[dict]:
+    def _load_standard_csv(self, filepath: str) -> Iterator[ProductRow]:
         """Load standard format CSV (Shure, Connect Beauty, Cherry).
 
         Normalizes various column names to standard format.
+        Only the first row for each SKU is used.
+
+        Yields:
+            ProductRow for each valid product
         """
-        with open(filepath, encoding='utf-8-sig') as f:  # utf-8-sig handles BOM
-            reader = csv.DictReader(f)
-            products = []
+        # utf-8-sig handles BOM
+        with open(
+            filepath, newline='', encoding='utf-8-sig', buffering=CSV_BUFFER_SIZE
+        ) as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+
+            # Resolve column names (which vary between suppliers) once per file
+            get_sku = _column_getter(header, 'SKU', 'Product Code')
+            get_name = _column_getter(header, 'Product Name', 'Name', 'Title')
+            get_brand = _column_getter(header, 'Brand', 'Manufacturer')
+            get_barcode = _column_getter(header, 'Barcode', 'EAN')
+            get_category = _column_getter(header, 'Category')
+            get_price = _column_getter(
+                header, 'Unit Price (GBP)', 'Unit Price', 'Price'
+            )
+
+            seen = set()
+
             for row in reader:
-                # Normalize column names to handle different formats
-                normalized = {
-                    'SKU': row.get('SKU', '') or row.get('Product Code', '') or '',
-                    'Product Name': row.get('Product Name', '')
-                    or row.get('Name', '')
-                    or row.get('Title', '')
-                    or '',
-                    'Brand': row.get('Brand', '') or row.get('Manufacturer', '') or '',
-                    'Barcode': row.get('Barcode', '') or row.get('EAN', '') or '',
-                    'Category': row.get('Category', '') or '',
-                    'Unit Price (GBP)': row.get('Unit Price (GBP)', '')
-                    or row.get('Unit Price', '')
-                    or row.get('Price', '')
-                    or '',
-                }
-                # Only add if we have a valid product name and SKU (skip N/A)
-                if (
-                    normalized['Product Name']
-                    and normalized['SKU']
-                    and normalized['SKU'].upper() != 'N/A'
-                ):
-                    products.append(normalized)
-            return products
-
-    def _load_wts_csv(self, filepath: str) -> list[dict]:
-        """Load WTS format CSV - normalize to standard columns."""
-        with open(filepath, encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            products = []
+                sku = get_sku(row)
+
+                # Only add if we have a valid SKU (skip N/A, and repeated SKUs)
+                if not sku or sku in seen or sku.upper() == 'N/A':
+                    continue
+
+                # ... and a valid product name
+                if name := get_name(row):
+                    seen.add(sku)
+
+                    yield ProductRow(
+                        sku=sku,
+                        name=name,
+                        brand=get_brand(row),
+                        barcode=get_barcode(row),
+                        category=get_category(row),
+                        price=get_price(row),
+                    )
+
+    def _load_wts_csv(self, filepath: str) -> Iterator[ProductRow]:
+        """Load WTS format CSV - normalize to standard columns.
+
+        Only the first row for each SKU is used.
+
+        Yields:
+            ProductRow for each valid product
+        """
+        with open(
+            filepath, newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE
+        ) as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+
+            # WTS columns: ProdCode, Product Description, Price (in £ Price column)
+            get_sku = _column_getter(header, 'ProdCode')
+            get_name = _column_getter(header, 'Product Description')
+            get_barcode = _column_getter(header, 'Barcode')
+            get_price = _column_getter(header, 'Each', 'Price')
+
+            seen = set()
+
             for row in reader:
-                # Normalize WTS format to standard
-                # WTS columns: ProdCode, Product Description, Price (in £ Price column)
-                normalized = {
-                    'SKU': row.get('ProdCode', ''),
-                    'Product Name': row.get('Product Description', ''),
-                    'Brand': '',
-                    'Barcode': row.get('Barcode', '') or '',
-                    'Category': '',
-                    'Unit Price (GBP)': row.get('Each', '')
-                    or row.get('Price', '')
-                    or '',
-                }
-                if normalized['Product Name']:
-                    products.append(normalized)
-            return products
-
-    def _load_very_csv(self, filepath: str) -> list[dict]:
-        """Load Very format CSV - skip header lines, normalize column names."""
-        with open(filepath, encoding='utf-8') as f:
-            lines = f.readlines()
-
-        # Find the header line (contains "Title,-,Barcode")
-        header_idx = None
-        for i, line in enumerate(lines):
-            if 'Title' in line and 'Barcode' in line:
-                header_idx = i
-                break
-
-        if header_idx is None:
-            return []
-
-        # Read from header line onwards
-        csv_content = ''.join(lines[header_idx:])
-        reader = csv.DictReader(csv_content.splitlines())
-
-        products = []
-        for row in reader:
-            # Normalize to standard format
-            normalized = {
-                'SKU': row.get('Title', '')[:100],  # Use Title as SKU (first 100 chars)
-                'Product Name': row.get('Title', ''),
-                'Brand': 'Very Cosmetics',
-                'Barcode': row.get('Barcode', '') or '',
-                'Category': '',
-                'Unit Price (GBP)': row.get('Price', '')
-                or row.get('Compare at price', '')
-                or '',
-            }
-            if normalized['Product Name']:
-                products.append(normalized)
+                sku = get_sku(row)
+
+                # Skip repeated SKUs
+                if sku in seen:
+                    continue
+
+                if name := get_name(row):
+                    if sku:
+                        seen.add(sku)
+
+                    yield ProductRow(
+                        sku=sku,
+                        name=name,
+                        brand='',
+                        barcode=get_barcode(row),
+                        category='',
+                        price=get_price(row),
+                    )
 
-        return products
+    def _load_very_csv(self, filepath: str) -> Iterator[ProductRow]:
+        """Load Very format CSV - skip header lines, normalize column names.
+
+        Only the first row for each SKU is used.
+
+        Yields:
+            ProductRow for each valid product
+        """
+        with open(
+            filepath, newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE
+        ) as f:
+            # Skip to the header line (contains "Title,-,Barcode")
+            for line in f:
+                if 'Title' in line and 'Barcode' in line:
+                    header = line
+                    break
+            else:
+                return
+
+            # Read from header line onwards
+            reader = csv.reader(itertools.chain([header], f))
+            header = next(reader)
+
+            get_title = _column_getter(header, 'Title')
+            get_barcode = _column_getter(header, 'Barcode')
+            get_price = _column_getter(header, 'Price', 'Compare at price')
+
+            seen = set()
+
+            for row in reader:
+                title = get_title(row)
+
+                # Use Title as SKU (first 100 chars)
+                sku = title[:100]
+
+                # Skip repeated SKUs
+                if title and sku not in seen:
+                    seen.add(sku)
+
+                    yield ProductRow(
+                        sku=sku,
+                        name=title,
+                        brand='Very Cosmetics',
+                        barcode=get_barcode(row),
+                        category='',
+                        price=get_price(row),
+                    )
 
     def extract_price(self, price_str: str) -> Optional[Decimal]:
         """Extract price from string (handle £, €, etc)."""
@@ -175,185 +328,351 @@ class SupplierProductImporter:
             return None
 
         # Remove currency symbols and extra text
-        price_str = price_str.replace('£', '').replace('€', '').split('each')[0].strip()
+        price_str = price_str.translate(CURRENCY_SYMBOLS).partition('each')[0].strip()
 
         try:
             return Decimal(price_str)
-        except:
+        except InvalidOperation:
             return None
 
     def generate_ipn(self, sku: str, name: str) -> str:
         """Generate IPN based on SKU hash.
 
         Format: IPN-XXXXXXXX where XXXXXXXX is MD5 hash of SKU+name.
+
+        The hash must not change, as existing Parts are matched by this IPN
+        when the same products are imported again.
         """
         hash_input = f'{sku}-{name}'.encode()
-        hash_hex = hashlib.md5(hash_input).hexdigest()[:8].upper()
+        hash_hex = (
+            hashlib.md5(hash_input, usedforsecurity=False).hexdigest()[:8].upper()
+        )
         return f'IPN-{hash_hex}'
 
-    def deduplicate_products(self) -> dict[str, dict]:
+    def deduplicate_products(
+        self, files: Iterable[tuple[str, Iterable[ProductRow]]]
+    ) -> dict[str, ProductRecord]:
         """Process products by SKU (not barcode).
 
         Each SKU is unique, so we keep all products.
+
+        Args:
+            files: Iterable of (supplier_name, products) pairs, consumed row by row
+
         Returns dict: sku -> product data.
         """
         self.log('\n🔄 Processing products by SKU...')
 
         products_by_sku = {}
 
-        for _filename, supplier_name, products in self.files_data:
+        for supplier_name, products in files:
             for product in products:
                 # Extract SKU - this is unique per supplier
-                sku = product.get('SKU', '').strip()
+                sku = product.sku.strip()
 
                 if not sku:
-                    self.log(
-                        f'   ⚠ No SKU for: {product.get("Product Name", product.get("Title", "Unknown"))}'
-                    )
+                    self.log(f'   ⚠ No SKU for: {product.name or "Unknown"}')
                     continue
 
                 if sku not in products_by_sku:
                     # First occurrence - create product record
-                    category_name = product.get('Category') or ''
+                    category_name = product.category
                     category_obj = (
                         self.get_or_create_category(category_name)
                         if category_name
                         else None
                     )
 
-                    products_by_sku[sku] = {
-                        'sku': sku,
-                        'name': product.get('Product Name')
-                        or product.get('Title')
-                        or 'Unknown',
-                        'brand': product.get('Brand')
-                        or product.get('Manufacturer')
-                        or '',
-                        'category': category_name,
-                        'category_obj': category_obj,
-                        'barcode': product.get('Barcode') or product.get('EAN') or '',
-                        'suppliers': {},  # supplier_name -> {sku, price, ...}
-                    }
+                    products_by_sku[sku] = ProductRecord(
+                        sku=sku,
+                        name=product.name or 'Unknown',
+                        brand=product.brand,
+                        category=category_name,
+                        category_obj=category_obj,
+                        barcode=product.barcode,
+                    )
 
                 # Add this supplier's info
-                products_by_sku[sku]['suppliers'][supplier_name] = {
-                    'sku': sku,
-                    'price': self.extract_price(
-                        product.get('Unit Price (GBP)')
-                        or product.get('Unit Price')
-                        or product.get('Price', '')
-                    ),
-                    'barcode': product.get('Barcode') or product.get('EAN') or '',
-                    'currency': 'GBP',
-                }
+                # (the price is only parsed once the SupplierPart is created)
+                products_by_sku[sku].suppliers[supplier_name] = SupplierInfo(
+                    sku=sku, price_text=product.price, barcode=product.barcode
+                )
 
         self.log(f'   ✓ Total products by SKU: {len(products_by_sku)}')
         return products_by_sku
 
     def get_or_create_supplier(self, supplier_name: str) -> Company:
         """Get or create a supplier company."""
+        if supplier_name in self.supplier_map:
+            return self.supplier_map[supplier_name]
+
         company, created = Company.objects.get_or_create(
             name=supplier_name,
             defaults={'description': f'Supplier: {supplier_name}', 'is_supplier': True},
         )
         if created:
             self.log(f'   ✓ Created supplier: {supplier_name}')
+
+        self.supplier_map[supplier_name] = company
         return company
 
+    @staticmethod
+    def prefetch_suppliers(supplier_names) -> dict[str, Company]:
+        """Fetch existing supplier companies by name in a single query."""
+        return {
+            company.name: company
+            for company in Company.objects.filter(
+                name__in=set(supplier_names), is_supplier=True
+            )
+        }
+
     def get_or_create_category(self, category_name: str) -> Optional[PartCategory]:
         """Get or create a part category."""
         if not category_name:
             return None
 
+        if category_name in self.category_map:
+            return self.category_map[category_name]
+
         category, _created = PartCategory.objects.get_or_create(
             name=category_name, defaults={'description': f'Category: {category_name}'}
         )
+
+        self.category_map[category_name] = category
         return category
 
-    def create_part(self, product_data: dict) -> Optional[Part]:
-        """Create a Part from product data with custom IPN based on SKU.
+    def prefetch_ipns(self):
+        """Load the IPNs of all existing Parts in a single query."""
+        self.existing_ipns = set(
+            Part.objects.filter(IPN__isnull=False)
+            .values_list('IPN', flat=True)
+            .iterator(chunk_size=5000)
+        )
+
+    def ipn_exists(self, ipn: str) -> bool:
+        """Check if a Part with the given IPN exists (see prefetch_ipns)."""
+        return ipn in self.existing_ipns
 
-        If Part with same IPN already exists, returns existing Part.
+    def _parts_by_ipn(self, ipns) -> dict[str, Part]:
+        """Fetch existing Parts by IPN, in batches of BATCH_SIZE.
+
+        Returns dict: IPN -> Part (the first match, if the IPN is not unique).
         """
-        try:
-            # Truncate name to max 100 chars (model limit)
-            name = product_data['name'][:100]
+        ipns = list(ipns)
+        parts = {}
+
+        for idx in range(0, len(ipns), self.BATCH_SIZE):
+            for part in Part.objects.filter(IPN__in=ipns[idx : idx + self.BATCH_SIZE]):
+                parts.setdefault(part.IPN, part)
+
+        return parts
+
+    def generate_ipns(
+        self, products_by_sku: dict[str, ProductRecord]
+    ) -> dict[str, str]:
+        """Generate a distinct IPN for each product.
+
+        If the IPN hash of a product collides with that of an earlier product
+        in the same import, a salted hash is used for the later product.
+        The result depends only on the products (and their order), so the
+        same IPNs are generated when the files are imported again.
+
+        Returns dict: sku -> IPN.
+        """
+        ipn_by_sku = {
+            sku: self.generate_ipn(sku, product_data.name)
+            for sku, product_data in products_by_sku.items()
+        }
+
+        if len(set(ipn_by_sku.values())) == len(ipn_by_sku):
+            return ipn_by_sku
+
+        seen = set()
+
+        for sku, ipn in ipn_by_sku.items():
+            salt = 0
+
+            while ipn in seen:
+                salt += 1
+                ipn = self.generate_ipn(sku, f'{products_by_sku[sku].name}-{salt}')
+
+            seen.add(ipn)
+            ipn_by_sku[sku] = ipn
+
+        return ipn_by_sku
+
+    def create_parts(
+        self, products_by_sku: dict[str, ProductRecord]
+    ) -> dict[str, Part]:
+        """Create Parts from product data with custom IPNs based on SKU.
+
+        If a Part with the same IPN already exists, the existing Part is used.
+        All new Parts are written to the database in bulk.
+
+        Returns dict: sku -> Part.
+        """
+        ipn_by_sku = self.generate_ipns(products_by_sku)
 
-            # Generate IPN from SKU+name
-            ipn = self.generate_ipn(product_data['sku'], product_data['name'])
+        candidate_ipns = set(ipn_by_sku.values())
+        new_ipns = {ipn for ipn in candidate_ipns if not self.ipn_exists(ipn)}
 
-            # Check if Part with this IPN already exists in DB
-            existing_part = Part.objects.filter(IPN=ipn).first()
-            if existing_part:
+        # Only Parts with a known IPN need to be fetched from the database
+        existing_parts = self._parts_by_ipn(candidate_ipns - new_ipns)
+
+        # Skip Part creation entirely if all Parts exist (e.g. a repeated import)
+        if not new_ipns:
+            self.log(f'   ⏭ All {len(existing_parts)} Parts already exist')
+            return {
+                sku: existing_parts[ipn]
+                for sku, ipn in ipn_by_sku.items()
+                if ipn in existing_parts
+            }
+
+        self.log(
+            f'   • Creating {len(new_ipns)} Parts'
+            f' ({len(candidate_ipns) - len(new_ipns)} already exist)'
+        )
+
+        parts_by_sku = {}
+        new_parts = []
+        new_skus = []
+
+        next_tree_id = Part.getNextTreeID()
+
+        for sku, product_data in products_by_sku.items():
+            ipn = ipn_by_sku[sku]
+
+            if existing_part := existing_parts.get(ipn):
                 self.log(f'   ⏭ Part already exists: {existing_part.name} (IPN: {ipn})')
-                return existing_part
-
-            # Check if we already created this in current session
-            if ipn in self.used_ipns:
-                self.log(f'   ⏭ Part with IPN {ipn} already created in this session')
-                return None
-
-            # Track this IPN as used
-            self.used_ipns.add(ipn)
-
-            # Create part with custom IPN
-            part = Part.objects.create(
-                name=name,
-                description=product_data.get('brand', ''),
-                category=product_data.get('category_obj'),
-                component=True,
-                IPN=ipn,
-            )
+                parts_by_sku[sku] = existing_part
+                continue
 
-            self.log(f'   ✓ Created Part: {part.name} (IPN: {part.IPN})')
-            self.created_parts.append(part)
-            return part
+            # bulk_create() bypasses save(), so pre-calculate the MPTT fields
+            # (each new Part is a top-level node in its own tree)
+            new_parts.append(
+                Part(
+                    # Truncate name to max 100 chars (model limit)
+                    name=product_data.name[:100],
+                    description=product_data.brand,
+                    category=product_data.category_obj,
+                    component=True,
+                    IPN=ipn,
+                    tree_id=next_tree_id,
+                    level=0,
+                    lft=1,
+                    rght=2,
+                )
+            )
+            new_skus.append(sku)
+            next_tree_id += 1
 
+        try:
+            # (savepoint, so a failure does not break an enclosing transaction)
+            with transaction.atomic():
+                Part.objects.bulk_create(new_parts, batch_size=self.BATCH_SIZE)
         except Exception as e:
-            error_msg = f'Error creating part for {product_data["name"]}: {e!s}'
+            error_msg = f'Error creating {len(new_parts)} Parts: {e!s}'
             self.errors.append(error_msg)
             self.log(f'   ✗ {error_msg}')
-            return None
+            return parts_by_sku
+
+        if all(part.pk for part in new_parts):
+            created_parts = {part.IPN: part for part in new_parts}
+        else:
+            # Primary keys are not set by bulk_create() on all databases (e.g. MySQL),
+            # in which case the new Parts are read back by IPN
+            created_parts = self._parts_by_ipn(part.IPN for part in new_parts)
+
+        for sku, new_part in zip(new_skus, new_parts, strict=True):
+            if part := created_parts.get(new_part.IPN):
+                self.log(f'   ✓ Created Part: {part.name} (IPN: {part.IPN})')
+                self.created_parts.append(part)
+                self.existing_ipns.add(part.IPN)
+                parts_by_sku[sku] = part
+
+        return parts_by_sku
+
+    def prefetch_supplier_parts(self, parts: Iterable[Part]):
+        """Load the existing SupplierParts for the given Parts, in batches of BATCH_SIZE.
+
+        Parts created by this import are skipped, as they cannot have any SupplierParts yet.
+        """
+        created = {part.pk for part in self.created_parts}
+        part_ids = list({part.pk for part in parts} - created)
+
+        for idx in range(0, len(part_ids), self.BATCH_SIZE):
+            self.existing_supplier_parts.update(
+                SupplierPart.objects.filter(
+                    part_id__in=part_ids[idx : idx + self.BATCH_SIZE]
+                ).values_list('part_id', 'supplier_id', 'SKU')
+            )
 
     def create_supplier_part(
         self, part: Part, supplier: Company, sku: str, price: Optional[Decimal]
     ) -> bool:
-        """Create a SupplierPart linking Part to Supplier."""
+        """Queue a SupplierPart linking Part to Supplier for bulk creation."""
         try:
-            supplier_part, created = SupplierPart.objects.get_or_create(
-                part=part,
-                supplier=supplier,
-                SKU=sku,
-                defaults={'note': f'Imported from {supplier.name}'},
-            )
+            key = (part.pk, supplier.pk, sku)
 
-            if price and created:
-                # Try to set price if model allows it
-                try:
-                    supplier_part.base_cost = price
-                    supplier_part.save()
-                except:
-                    pass
-
-            if created:
-                self.log(f'      • Created SupplierPart: {sku} @ {supplier.name}')
-                self.created_supplier_parts.append(supplier_part)
-                return True
-            else:
+            if key in self.existing_supplier_parts:
                 self.log(
                     f'      • SupplierPart already exists: {sku} @ {supplier.name}'
                 )
                 return False
 
+            # Fields normally populated by SupplierPart.clean() are set here,
+            # as bulk_create() bypasses save()
+            supplier_part = SupplierPart(
+                part=part,
+                supplier=supplier,
+                SKU=sku,
+                note=f'Imported from {supplier.name}',
+                base_cost=price or 0,
+                pack_quantity='1',
+                pack_quantity_native=1,
+            )
+
+            self.pending_supplier_parts.append(supplier_part)
+            self.existing_supplier_parts.add(key)
+
+            if len(self.pending_supplier_parts) >= self.BATCH_SIZE:
+                self.flush_supplier_parts()
+
+            self.log(f'      • Created SupplierPart: {sku} @ {supplier.name}')
+            return True
+
         except Exception as e:
             error_msg = f'Error creating SupplierPart {sku}: {e!s}'
             self.errors.append(error_msg)
             self.log(f'      ✗ {error_msg}')
             return False
 
+    def flush_supplier_parts(self):
+        """Write all queued SupplierParts to the database in bulk."""
+        if not self.pending_supplier_parts:
+            return
+
+        try:
+            with transaction.atomic():
+                SupplierPart.objects.bulk_create(
+                    self.pending_supplier_parts,
+                    batch_size=self.BATCH_SIZE,
+                    ignore_conflicts=True,
+                )
+            self.created_supplier_parts.extend(self.pending_supplier_parts)
+        except Exception as e:
+            error_msg = f'Error creating {len(self.pending_supplier_parts)} SupplierParts: {e!s}'
+            self.errors.append(error_msg)
+            self.log(f'      ✗ {error_msg}')
+
+        self.pending_supplier_parts = []
+
+    @transaction.atomic
     def import_all(self, csv_files_with_suppliers: list[tuple[str, str]]) -> dict:
         """Import all CSV files with their supplier names.
 
+        The import is run in a single transaction.
+
         Args:
             csv_files_with_suppliers: List of tuples (filepath, supplier_name)
 
@@ -364,15 +683,24 @@ class SupplierProductImporter:
         self.log('🚀 Starting Supplier Product Import')
         self.log('=' * 60)
 
-        # Step 1: Load all files
-        for filepath, supplier_name in csv_files_with_suppliers:
-            self.load_csv_file(filepath, supplier_name)
+        # Fetch any suppliers which were not provided up front in a single query
+        if missing_suppliers := {
+            supplier_name
+            for _filepath, supplier_name in csv_files_with_suppliers
+            if supplier_name not in self.supplier_map
+        }:
+            self.supplier_map.update(self.prefetch_suppliers(missing_suppliers))
+
+        # Step 1 + 2: Load all files, and get products by SKU (not barcode)
+        products_by_sku = self.deduplicate_products(
+            (supplier_name, self.load_csv_file(filepath))
+            for filepath, supplier_name in csv_files_with_suppliers
+        )
 
-        if not self.files_data:
+        if not self.files_loaded:
             raise CommandError('No CSV files loaded successfully')
 
-        # Step 2: Get products by SKU (not barcode)
-        products_by_sku = self.deduplicate_products()
+        self.prefetch_ipns()
 
         # Step 3: Create parts and supplier parts
         total_products = len(products_by_sku)
@@ -380,27 +708,31 @@ class SupplierProductImporter:
             f'\n📦 Creating Parts and SupplierParts ({total_products} products)...\n'
         )
 
-        for idx, (_sku, product_data) in enumerate(products_by_sku.items(), 1):
+        parts_by_sku = self.create_parts(products_by_sku)
+        self.prefetch_supplier_parts(parts_by_sku.values())
+
+        for idx, (sku, product_data) in enumerate(products_by_sku.items(), 1):
             # Progress log every 50 products or at start/end
             if idx == 1 or idx % 50 == 0 or idx == total_products:
                 progress = (idx / total_products) * 100
                 self.log(f'⏳ Progress: {idx}/{total_products} ({progress:.1f}%)')
 
-            # Create Part
-            part = self.create_part(product_data)
+            part = parts_by_sku.get(sku)
             if not part:
                 continue
 
             # Create SupplierPart for each supplier
-            for supplier_name, supplier_info in product_data['suppliers'].items():
+            for supplier_name, supplier_info in product_data.suppliers.items():
                 supplier = self.get_or_create_supplier(supplier_name)
                 self.create_supplier_part(
                     part=part,
                     supplier=supplier,
-                    sku=supplier_info['sku'],
-                    price=supplier_info['price'],
+                    sku=supplier_info.sku,
+                    price=self.extract_price(supplier_info.price_text),
                 )
 
+        self.flush_supplier_parts()
+
         # Summary
         self.log('\n' + '=' * 60)
         self.log('✅ Import Complete')
@@ -424,4 +756,26 @@ class SupplierProductImporter:
 
         return summary
 
-        return summary
+
+def run_import(csv_files_with_suppliers: list[tuple[str, str]], verbose=False) -> dict:
+    """Run a complete supplier product import.
+
+    Entry point for running the import as a background task.
+
+    Args:
+        csv_files_with_suppliers: List of tuples (filepath, supplier_name)
+        verbose: Log progress messages
+
+    Returns:
+        Dict with import statistics
+    """
+    csv_files_with_suppliers = [tuple(item) for item in csv_files_with_suppliers]
+
+    importer = SupplierProductImporter(
+        verbose=verbose,
+        supplier_map=SupplierProductImporter.prefetch_suppliers(
+            supplier for _filepath, supplier in csv_files_with_suppliers
+        ),
+    )
+
+    return importer.import_all(csv_files_with_suppliers)
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-16 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("importer", "0007_change_supplier_name_to_fk"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="supplierproductimportsession",
+            name="started",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Time at which the import task started running",
+                null=True,
+                verbose_name="Started",
+            ),
+        ),
+    ]
@@ -814,6 +814,12 @@ class SupplierProductImportSession(models.Model):
         default=StatusChoices.PENDING,
         verbose_name=_('Status'),
     )
+    started = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name=_('Started'),
+        help_text=_('Time at which the import task started running'),
+    )
 
     # Results
     parts_created = models.PositiveIntegerField(
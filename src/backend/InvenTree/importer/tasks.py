@@ -1,5 +1,9 @@
 """Task definitions for the 'importer' app."""
 
+import contextlib
+import os
+import shutil
+import tempfile
 from datetime import timedelta
 
 import structlog
@@ -26,6 +30,91 @@ def import_data(session_id: int):
         return
 
 
+def run_supplier_import(session_id: int):
+    """Run the supplier product import for a SupplierProductImportSession.
+
+    The results (or the error) are written back to the session.
+    When offloaded, the task runs with a timeout of max_task_timeout() seconds.
+    """
+    import importer.models
+    from importer.import_supplier_products import SupplierProductImporter
+
+    StatusChoices = importer.models.SupplierProductImportSession.StatusChoices
+
+    try:
+        session = importer.models.SupplierProductImportSession.objects.select_related(
+            'supplier'
+        ).get(pk=session_id)
+    except importer.models.SupplierProductImportSession.DoesNotExist:
+        logger.error(
+            "Supplier product import session with ID '%s' does not exist", session_id
+        )
+        return
+
+    # Record the start time, which fail_stale_supplier_imports() measures from
+    session.started = InvenTree.helpers.current_time()
+    session.save(update_fields=['started', 'updated'])
+
+    try:
+        # Copy the CSV file to a temp file for the importer
+        # (streamed in chunks, without decoding it in memory)
+        with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as tmp:
+            with session.data_file.open('rb') as src:
+                shutil.copyfileobj(src, tmp, length=64 * 1024)
+            tmp_path = tmp.name
+
+        try:
+            # Run import
+            product_importer = SupplierProductImporter(verbose=True)
+            result = product_importer.import_all([(tmp_path, session.supplier.name)])
+        finally:
+            # Clean up temp file
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+
+        # Update session with results
+        session.parts_created = result['created_parts']
+        session.supplier_parts_created = result['created_supplier_parts']
+        session.errors = result.get('errors', [])
+        session.status = StatusChoices.COMPLETED
+
+        # Save full import log
+        session.import_log = product_importer.get_log()
+        session.save()
+
+    except Exception as e:
+        session.status = StatusChoices.FAILED
+        session.errors = [str(e)]
+        session.import_log = f'❌ Import failed: {e!s}'
+        session.save()
+
+        logger.error('Supplier product import failed: %s', e, exc_info=True)
+
+
+def fail_stale_supplier_imports():
+    """Mark supplier product import sessions which can no longer finish as failed.
+
+    A background import which is killed (e.g. when it exceeds the task timeout)
+    never reaches its error handler, so its session would stay 'in progress'.
+    """
+    import importer.models
+
+    StatusChoices = importer.models.SupplierProductImportSession.StatusChoices
+
+    # Allow a margin on top of the task timeout
+    before = InvenTree.helpers.current_time() - timedelta(
+        seconds=InvenTree.tasks.max_task_timeout() + 60
+    )
+
+    # Measured from the start of the task (not from when it was queued)
+    importer.models.SupplierProductImportSession.objects.filter(
+        status=StatusChoices.IN_PROGRESS, started__lt=before
+    ).update(
+        status=StatusChoices.FAILED,
+        errors=['Import did not finish (the background task was stopped or timed out)'],
+    )
+
+
 @InvenTree.tasks.scheduled_task(InvenTree.tasks.ScheduledTask.DAILY)
 def cleanup_import_sessions():
     """Periodically remove old import sessions.
@@ -1,20 +1,37 @@
 """Unit tests for the 'importer' app."""
 
 import os
+from datetime import timedelta
+from decimal import Decimal
 
 from django.core.files.base import ContentFile
+from django.core.management.base import CommandError
 from django.urls import reverse
 
-from importer.models import DataImportRow, DataImportSession
+import importer.tasks
+from company.models import Company, SupplierPart
+from importer.import_supplier_products import SupplierProductImporter
+from importer.models import (
+    DataImportRow,
+    DataImportSession,
+    SupplierProductImportSession,
+)
+from InvenTree.helpers import current_time
+from InvenTree.tasks import max_task_timeout
 from InvenTree.unit_test import AdminTestCase, InvenTreeAPITestCase, InvenTreeTestCase
+from part.models import Part, PartCategory
 
 
 class ImporterMixin:
     """Helpers for import tests."""
 
+    def helper_path(self, fn: str) -> str:
+        """Return the path to a test data file."""
+        return os.path.join(os.path.dirname(__file__), 'test_data', fn)
+
     def helper_file(self, fn: str) -> ContentFile:
         """Return test data."""
-        file_path = os.path.join(os.path.dirname(__file__), 'test_data', fn)
+        file_path = self.helper_path(fn)
 
         with open(file_path, encoding='utf-8') as input_file:
             data = input_file.read()
@@ -74,6 +91,208 @@ class ImporterTest(ImporterMixin, InvenTreeTestCase):
         """Test default field values."""
 
 
+class SupplierProductImportTest(ImporterMixin, InvenTreeTestCase):
+    """Tests for the supplier product importer."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create the supplier for the imports."""
+        super().setUpTestData()
+
+        cls.supplier = Company.objects.create(
+            name='Test Supplier', is_supplier=True, is_customer=False
+        )
+
+    def run_import(self, fn='supplier_products.csv') -> tuple[dict, list]:
+        """Import a test data file, and return the summary and the errors."""
+        product_importer = SupplierProductImporter()
+        result = product_importer.import_all([
+            (self.helper_path(fn), self.supplier.name)
+        ])
+
+        return result, product_importer.errors
+
+    def test_import_all(self):
+        """Parts and SupplierParts are created for each distinct SKU."""
+        n_parts = Part.objects.count()
+
+        result, errors = self.run_import()
+
+        self.assertEqual(errors, [])
+
+        # 12 rows, less one repeated SKU and one 'N/A' SKU
+        self.assertEqual(result['total_products'], 10)
+        self.assertEqual(result['created_parts'], 10)
+        self.assertEqual(result['created_supplier_parts'], 10)
+
+        self.assertEqual(Part.objects.count(), n_parts + 10)
+        self.assertEqual(
+            SupplierPart.objects.filter(supplier=self.supplier).count(), 10
+        )
+
+        # The first row for a repeated SKU is used
+        sp = SupplierPart.objects.get(supplier=self.supplier, SKU='SM58')
+        self.assertEqual(sp.part.name, 'Dynamic Vocal Microphone')
+        self.assertEqual(sp.part.description, 'Shure')
+        self.assertEqual(sp.base_cost, Decimal('89.00'))
+        self.assertTrue(sp.part.IPN.startswith('IPN-'))
+        self.assertEqual(sp.part.category.name, 'Microphones')
+
+        self.assertEqual(PartCategory.objects.get(name='Cables').parts.count(), 4)
+
+        # Each new Part is the root of its own (valid) tree
+        for part in Part.objects.filter(IPN__startswith='IPN-'):
+            self.assertEqual(part.level, 0)
+            self.assertEqual(part.lft, 1)
+            self.assertEqual(part.rght, 2)
+
+        self.assertEqual(
+            Part.objects.filter(IPN__startswith='IPN-')
+            .values('tree_id')
+            .distinct()
+            .count(),
+            10,
+        )
+
+    def test_import_repeated(self):
+        """Importing the same file again does not create anything."""
+        self.run_import()
+
+        n_parts = Part.objects.count()
+        n_supplier_parts = SupplierPart.objects.count()
+
+        result, errors = self.run_import()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(result['total_products'], 10)
+        self.assertEqual(result['created_parts'], 0)
+        self.assertEqual(result['created_supplier_parts'], 0)
+
+        self.assertEqual(Part.objects.count(), n_parts)
+        self.assertEqual(SupplierPart.objects.count(), n_supplier_parts)
+
+    def test_import_existing_parts(self):
+        """Existing Parts (matched by IPN) are linked to the supplier, not duplicated."""
+        self.run_import()
+
+        # Remove some of the SupplierParts, and import again
+        SupplierPart.objects.filter(
+            supplier=self.supplier, SKU__startswith='XLR'
+        ).delete()
+
+        n_parts = Part.objects.count()
+
+        result, errors = self.run_import()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(result['created_parts'], 0)
+        self.assertEqual(result['created_supplier_parts'], 3)
+        self.assertEqual(Part.objects.count(), n_parts)
+
+    def test_import_missing_file(self):
+        """An import with no readable files fails, without creating anything."""
+        n_parts = Part.objects.count()
+
+        product_importer = SupplierProductImporter()
+
+        with self.assertRaises(CommandError):
+            product_importer.import_all([('does-not-exist.csv', self.supplier.name)])
+
+        self.assertEqual(len(product_importer.errors), 1)
+        self.assertIn('does-not-exist.csv', product_importer.errors[0])
+        self.assertEqual(Part.objects.count(), n_parts)
+
+    def create_session(self, **kwargs):
+        """Create an import session for the test data file."""
+        return SupplierProductImportSession.objects.create(
+            supplier=self.supplier,
+            data_file=self.helper_file('supplier_products.csv'),
+            **kwargs,
+        )
+
+    def test_run_supplier_import(self):
+        """The import task writes its results back to the session."""
+        session = self.create_session(
+            status=SupplierProductImportSession.StatusChoices.IN_PROGRESS
+        )
+
+        importer.tasks.run_supplier_import(session.pk)
+
+        session.refresh_from_db()
+
+        self.assertEqual(
+            session.status, SupplierProductImportSession.StatusChoices.COMPLETED
+        )
+        self.assertIsNotNone(session.started)
+        self.assertEqual(session.parts_created, 10)
+        self.assertEqual(session.supplier_parts_created, 10)
+        self.assertEqual(session.errors, [])
+        self.assertIn('Import Complete', session.import_log)
+
+        # Running the task again (e.g. a re-delivered task) creates nothing new
+        importer.tasks.run_supplier_import(session.pk)
+
+        session.refresh_from_db()
+
+        self.assertEqual(
+            session.status, SupplierProductImportSession.StatusChoices.COMPLETED
+        )
+        self.assertEqual(session.parts_created, 0)
+        self.assertEqual(session.supplier_parts_created, 0)
+
+    def test_run_supplier_import_failed(self):
+        """A failed import marks the session as failed."""
+        # An empty file, which cannot be read
+        session = SupplierProductImportSession.objects.create(
+            supplier=self.supplier,
+            data_file=ContentFile('', 'empty.csv'),
+            status=SupplierProductImportSession.StatusChoices.IN_PROGRESS,
+        )
+
+        importer.tasks.run_supplier_import(session.pk)
+
+        session.refresh_from_db()
+
+        self.assertEqual(
+            session.status, SupplierProductImportSession.StatusChoices.FAILED
+        )
+        self.assertEqual(len(session.errors), 1)
+        self.assertIn('No CSV files loaded', session.errors[0])
+
+        # A missing session is ignored
+        importer.tasks.run_supplier_import(session.pk + 1000)
+
+    def test_fail_stale_supplier_imports(self):
+        """Imports which started longer than the task timeout ago are failed."""
+        StatusChoices = SupplierProductImportSession.StatusChoices
+
+        stale = self.create_session(
+            status=StatusChoices.IN_PROGRESS,
+            started=current_time() - timedelta(seconds=2 * max_task_timeout()),
+        )
+        running = self.create_session(
+            status=StatusChoices.IN_PROGRESS, started=current_time()
+        )
+        queued = self.create_session(status=StatusChoices.IN_PROGRESS)
+        completed = self.create_session(
+            status=StatusChoices.COMPLETED,
+            started=current_time() - timedelta(seconds=2 * max_task_timeout()),
+        )
+
+        importer.tasks.fail_stale_supplier_imports()
+
+        for session, status in [
+            (stale, StatusChoices.FAILED),
+            (running, StatusChoices.IN_PROGRESS),
+            (queued, StatusChoices.IN_PROGRESS),
+            (completed, StatusChoices.COMPLETED),
+        ]:
+            session.refresh_from_db()
+            self.assertEqual(session.status, status)
+
+        self.assertEqual(len(stale.errors), 1)
+
+
 class ImportAPITest(ImporterMixin, InvenTreeAPITestCase):
     """End-to-end tests for the importer API."""
 
@@ -2,22 +2,112 @@
 
 import json
 import re
-from datetime import datetime
+import threading
 from decimal import Decimal
 
+from django.conf import settings
 from django.contrib import admin, messages
-from django.db.models import Q
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import Count, Exists, OuterRef, Q
+from django.db.models.functions import Lower
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import path, reverse
-from django.utils.html import format_html
+from django.utils.html import format_html, format_html_join
 
+import InvenTree.ready
+import invoice_manager.tasks
 from company.models import SupplierPart
+from InvenTree.status import is_worker_running
+from InvenTree.tasks import max_task_timeout, offload_task
 from order.models import PurchaseOrder, PurchaseOrderLineItem
-from part.models import Part
-from stock.models import StockItem, StockLocation
+from part import tasks as part_tasks
+from part.models import Part, PartCategory
+from plugin.events import trigger_event
+from stock.events import StockEvents
+from stock.models import StockItem, StockItemTracking
+from stock.status_codes import StockHistoryCode
 
-from .models import Invoice, InvoiceItem, InvoiceProcessingLog
+from .models import (
+    Invoice,
+    InvoiceItem,
+    InvoiceProcessingLog,
+    category_choices,
+    default_location,
+)
+
+# Technical details appended to item descriptions ("Line Weight:" and everything after, etc)
+DESCRIPTION_DETAILS_REGEX = re.compile(
+    r'(Line Weight:|Country of Origin:|HS Code:).*', re.DOTALL
+)
+
+# Location codes like "A/89", "B/25" at the end of a description
+LOCATION_CODE_REGEX = re.compile(r'\s+[A-Z]+/\d+\s*$')
+
+# Price info like "(£0.81/each)" or "(€0.81/each)"
+UNIT_PRICE_REGEX = re.compile(r'\([£€\?][\d.]+/each\)')
+
+# Punctuation, which is ignored when searching for parts
+NON_WORD_REGEX = re.compile(r'[^\w\s]')
+
+# Common words which are ignored when suggesting parts for an item description
+SUGGESTION_STOPWORDS = frozenset({
+    'the',
+    'and',
+    'for',
+    'with',
+    'pack',
+    'pcs',
+    'each',
+    'new',
+})
+
+# Minimum trigram similarity for a part name to match a search query
+TRIGRAM_SIMILARITY_THRESHOLD = 0.2
+
+# Number of processing log entries shown on the invoice change form
+RECENT_LOG_COUNT = 20
+
+
+# Formatted invoice data for the change form, keyed by (invoice pk, updated_at)
+_INVOICE_DATA_LOCK = threading.Lock()
+_INVOICE_DATA_CACHE = {}
+INVOICE_DATA_CACHE_SIZE = 32
+
+
+def format_invoice_data(invoice: Invoice) -> str:
+    """Return the invoice data as indented JSON.
+
+    The formatted text is cached until the invoice is next saved,
+    so large invoices are not re-serialized on every render.
+    """
+    if invoice.pk is None:
+        return json.dumps(invoice.invoice_data, indent=2)
+
+    key = (invoice.pk, invoice.updated_at)
+
+    with _INVOICE_DATA_LOCK:
+        if (text := _INVOICE_DATA_CACHE.get(key)) is not None:
+            return text
+
+    text = json.dumps(invoice.invoice_data, indent=2)
+
+    with _INVOICE_DATA_LOCK:
+        # Drop the oldest entry once the cache is full
+        if len(_INVOICE_DATA_CACHE) >= INVOICE_DATA_CACHE_SIZE:
+            _INVOICE_DATA_CACHE.pop(next(iter(_INVOICE_DATA_CACHE)))
+
+        _INVOICE_DATA_CACHE[key] = text
+
+    return text
+
+
+def parts_named(name: str):
+    """Return the parts whose name matches (case-insensitive), using the part_name_lower index."""
+    return Part.objects.annotate(name_lower=Lower('name')).filter(
+        name_lower=name.lower()
+    )
 
 
 class InvoiceItemInline(admin.TabularInline):
@@ -38,18 +128,44 @@ class InvoiceItemInline(admin.TabularInline):
         'matched',
         'notes',
     )
-    raw_id_fields = (
+    autocomplete_fields = (
         'part',
-    )  # Use popup instead of dropdown for Part selection (6000+ parts!)
+    )  # Search instead of dropdown for Part selection (6000+ parts!)
     can_delete = True  # Allow deleting items
 
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        """Skip the default Part prefetches when displaying the selected Part.
+
+        The default Part manager prefetches several relations,
+        which would otherwise run for every inline row.
+        """
+        if db_field.name == 'part':
+            kwargs['queryset'] = Part.objects.prefetch_related(None)
+
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    # URL of the 'create part' view with a '{}' placeholder for the item ID
+    _create_part_url_template = None
+
+    def create_part_url(self, item_id: int) -> str:
+        """Return the URL of the 'create part' view for an item.
+
+        The URL is only reversed once (inline instances are created per request),
+        rather than for every row.
+        """
+        if self._create_part_url_template is None:
+            prefix, suffix = reverse(
+                'admin:invoice_manager_create_part_from_item', args=[0]
+            ).rsplit('/0/', 1)
+            self._create_part_url_template = f'{prefix}/{{}}/{suffix}'
+
+        return self._create_part_url_template.format(item_id)
+
     def part_actions(self, obj):
         """Show action buttons for unmatched items."""
         if obj.pk and not obj.matched:
             # Link to create new Part with prefilled data from this item
-            create_url = reverse(
-                'admin:invoice_manager_create_part_from_item', args=[obj.pk]
-            )
+            create_url = self.create_part_url(obj.pk)
 
             return format_html(
                 '<a href="{}" target="_blank" class="button" '
@@ -65,15 +181,6 @@ class InvoiceItemInline(admin.TabularInline):
     part_actions.short_description = 'Actions'
 
 
-class InvoiceProcessingLogInline(admin.TabularInline):
-    """Inline display of processing logs."""
-
-    model = InvoiceProcessingLog
-    extra = 0
-    readonly_fields = ('action', 'message', 'created_at')
-    can_delete = False
-
-
 @admin.register(Invoice)
 class InvoiceAdmin(admin.ModelAdmin):
     """Admin interface for invoices."""
@@ -90,9 +197,11 @@ class InvoiceAdmin(admin.ModelAdmin):
         'created_at',
     )
     list_filter = ('status', 'supplier', 'created_at', 'invoice_date')
+    list_select_related = ('supplier', 'purchase_order')
     search_fields = ('invoice_number', 'supplier__name')
     readonly_fields = (
         'invoice_data_display',
+        'recent_logs',
         'created_at',
         'updated_at',
         'processed_at',
@@ -116,6 +225,7 @@ class InvoiceAdmin(admin.ModelAdmin):
             'Processing',
             {'fields': ('status', 'processing_log', 'error_message', 'processed_at')},
         ),
+        ('Processing Log', {'fields': ('recent_logs',), 'classes': ('collapse',)}),
         (
             'Extracted Data',
             {'fields': ('invoice_data_display',), 'classes': ('collapse',)},
@@ -126,7 +236,7 @@ class InvoiceAdmin(admin.ModelAdmin):
         ),
     )
 
-    inlines = [InvoiceItemInline, InvoiceProcessingLogInline]
+    inlines = [InvoiceItemInline]
     actions = [
         'extract_invoice_data',
         'auto_match_parts',
@@ -134,6 +244,28 @@ class InvoiceAdmin(admin.ModelAdmin):
         'reset_invoice',
     ]
 
+    def changelist_view(self, request, extra_context=None):
+        """Mark extractions which can no longer finish as failed, before listing them."""
+        invoice_manager.tasks.fail_stale_invoice_extractions()
+        return super().changelist_view(request, extra_context)
+
+    def change_view(self, request, object_id, form_url='', extra_context=None):
+        """Mark extractions which can no longer finish as failed, before showing one."""
+        invoice_manager.tasks.fail_stale_invoice_extractions()
+        return super().change_view(request, object_id, form_url, extra_context)
+
+    def get_queryset(self, request):
+        """Annotate the item counts displayed in the changelist."""
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                _total_items=Count('items'),
+                _missing_parts=Count('items', filter=Q(items__part__isnull=True)),
+                _unmatched_items=Count('items', filter=Q(items__matched=False)),
+            )
+        )
+
     def get_urls(self):
         """Add custom URLs for matching view."""
         urls = super().get_urls()
@@ -161,6 +293,24 @@ class InvoiceAdmin(admin.ModelAdmin):
         ]
         return custom_urls + urls
 
+    @staticmethod
+    def _parse_name(description: str) -> str:
+        """Extract a clean product name (before technical details) from an item description.
+
+        Example: "W7 Tea Tree Concealer - Light/Medium (3pcs) (1581) (£0.81/each) A/89 Line Weight: ..."
+        """
+        # Remove "Line Weight:", "Country of Origin:", "HS Code:" and everything after
+        name = DESCRIPTION_DETAILS_REGEX.sub('', description).strip()
+
+        # Remove location codes like "A/89", "B/25" at the end
+        name = LOCATION_CODE_REGEX.sub('', name)
+
+        # Remove price info like "(£0.81/each)" or "(€0.81/each)"
+        name = UNIT_PRICE_REGEX.sub('', name)
+
+        # Clean up extra spaces, and limit name length
+        return ' '.join(name.split())[:100]
+
     def create_part_from_item_view(self, request, item_id):
         """Create Part and SupplierPart from invoice item, then assign to item."""
         from part.models import Part
@@ -168,37 +318,9 @@ class InvoiceAdmin(admin.ModelAdmin):
         item = get_object_or_404(InvoiceItem, pk=item_id)
         invoice = item.invoice
 
-        # Parse description to extract useful data
+        # Clean product name, parsed from the description during extraction
         description = item.description or ''
-
-        # Try to extract clean product name (before technical details)
-        # Example: "W7 Tea Tree Concealer - Light/Medium (3pcs) (1581) (£0.81/each) A/89 Line Weight: ..."
-        name = description
-
-        # Remove "Line Weight:" and everything after
-        if 'Line Weight:' in name:
-            name = name.split('Line Weight:')[0].strip()
-
-        # Remove "Country of Origin:" and everything after
-        if 'Country of Origin:' in name:
-            name = name.split('Country of Origin:')[0].strip()
-
-        # Remove "HS Code:" and everything after
-        if 'HS Code:' in name:
-            name = name.split('HS Code:')[0].strip()
-
-        # Remove location codes like "A/89", "B/25" at the end
-        name = re.sub(r'\s+[A-Z]+/\d+\s*$', '', name)
-
-        # Remove price info like "(£0.81/each)" or "(€0.81/each)"
-        name = re.sub(r'\([£€\?][\d.]+/each\)', '', name)
-
-        # Clean up extra spaces
-        name = ' '.join(name.split())
-
-        # Limit name length
-        if len(name) > 100:
-            name = name[:100]
+        name = item.parsed_name or self._parse_name(description)
 
         if request.method == 'POST':
             # Get values from form (user-editable)
@@ -287,36 +409,56 @@ class InvoiceAdmin(admin.ModelAdmin):
         invoice = get_object_or_404(Invoice, pk=invoice_id)
         items = list(invoice.items.all().select_related('part'))
 
-        # Add suggestions for unmatched items
-        for item in items:
-            if not item.matched:
-                item.suggestions = self._get_part_suggestions(item, invoice.supplier)
-
         if request.method == 'POST':
             action = request.POST.get('action')
             matched_count = 0
 
+            # Selected part IDs for each item
+            part_ids = {}
+
+            for item in items:
+                try:
+                    part_ids[item.pk] = int(request.POST.get(f'part_{item.pk}') or 0)
+                except ValueError:
+                    part_ids[item.pk] = None
+
+            parts = Part.objects.prefetch_related(None).in_bulk([
+                pk for pk in part_ids.values() if pk
+            ])
+
+            to_update = []
+            to_log = []
+
             # Process each item's part assignment
             for item in items:
-                part_id = request.POST.get(f'part_{item.pk}')
+                part_id = part_ids[item.pk]
+
                 if part_id:
-                    try:
-                        part = Part.objects.get(pk=int(part_id))
-                        if item.part != part:
-                            item.match_part(part)
-                            matched_count += 1
-                            InvoiceProcessingLog.objects.create(
+                    part = parts.get(part_id)
+
+                    if part and item.part != part:
+                        item.part = part
+                        item.matched = True
+                        to_update.append(item)
+                        matched_count += 1
+                        to_log.append(
+                            InvoiceProcessingLog(
                                 invoice=invoice,
                                 action='MANUAL_MATCH',
                                 message=f"Manually matched '{item.description[:50]}' to {part.name}",
                             )
-                    except (Part.DoesNotExist, ValueError):
-                        pass
-                elif item.part:
+                        )
+                elif part_id == 0 and item.part:
                     # Clear existing match if field is empty
                     item.part = None
                     item.matched = False
-                    item.save()
+                    to_update.append(item)
+
+            with transaction.atomic():
+                InvoiceItem.objects.bulk_update(
+                    to_update, ['part', 'matched'], batch_size=500
+                )
+                InvoiceProcessingLog.objects.bulk_create(to_log, batch_size=500)
 
             if action == 'save_and_stock':
                 # Create stock entries for matched items
@@ -332,18 +474,23 @@ class InvoiceAdmin(admin.ModelAdmin):
                 reverse('admin:invoice_manager_invoice_match', args=[invoice_id])
             )
 
-        # Get categories for the create part modal
-        from part.models import PartCategory
+        # Add suggestions for unmatched items
+        unmatched = [item for item in items if not item.matched]
+        suggestions = self._get_part_suggestions(unmatched, invoice.supplier)
 
-        categories = PartCategory.objects.all().order_by('pathstring')
+        for item in unmatched:
+            item.suggestions = suggestions.get(item.pk, [])
+
+        # Get categories for the create part modal
+        categories = category_choices()
 
         context = {
             **self.admin_site.each_context(request),
             'invoice': invoice,
             'items': items,
             'total_items': len(items),
-            'matched_count': sum(1 for i in items if i.matched),
-            'unmatched_count': sum(1 for i in items if not i.matched),
+            'matched_count': len(items) - len(unmatched),
+            'unmatched_count': len(unmatched),
             'categories': categories,
             'title': f'Match Parts - Invoice {invoice.invoice_number}',
         }
@@ -360,13 +507,16 @@ class InvoiceAdmin(admin.ModelAdmin):
         # Multi-strategy search
         parts = self._search_parts_flexible(query, supplier_id)
 
+        # Fetch only the serialized fields (without the default Part prefetches)
+        parts = parts.prefetch_related(None).values('pk', 'name', 'IPN', 'description')
+
         return JsonResponse({
             'parts': [
                 {
-                    'id': p.pk,
-                    'name': p.name,
-                    'IPN': p.IPN or '',
-                    'description': p.description or '',
+                    'id': p['pk'],
+                    'name': p['name'],
+                    'IPN': p['IPN'] or '',
+                    'description': p['description'] or '',
                 }
                 for p in parts[:20]
             ]
@@ -377,7 +527,6 @@ class InvoiceAdmin(admin.ModelAdmin):
         import json
 
         from company.models import Company
-        from part.models import PartCategory
 
         if request.method != 'POST':
             return JsonResponse({'success': False, 'error': 'POST required'})
@@ -442,20 +591,27 @@ class InvoiceAdmin(admin.ModelAdmin):
             return JsonResponse({'success': False, 'error': str(e)})
 
     def _search_parts_flexible(self, query, supplier_id=None):
-        """Flexible part search - matches by various strategies."""
+        """Flexible part search - matches by various strategies.
+
+        Returns an unsliced queryset, so that the caller can limit the results
+        (and the fields which are fetched).
+        """
+        if connection.vendor == 'postgresql':
+            return self._search_parts_trigram(query, supplier_id)
+
         # Clean query
-        clean_query = re.sub(r'[^\w\s]', ' ', query.lower())
+        clean_query = NON_WORD_REGEX.sub(' ', query.lower())
         words = [w for w in clean_query.split() if len(w) >= 2]
 
         # Strategy 1: Exact match
-        parts = Part.objects.filter(name__iexact=query)
+        parts = parts_named(query)
         if parts.exists():
             return parts
 
         # Strategy 2: Contains full query
         parts = Part.objects.filter(name__icontains=query)
         if parts.exists():
-            return parts[:20]
+            return parts
 
         # Strategy 3: Match all words
         if words:
@@ -463,7 +619,7 @@ class InvoiceAdmin(admin.ModelAdmin):
             for word in words:
                 q = q.filter(name__icontains=word)
             if q.exists():
-                return q[:20]
+                return q
 
         # Strategy 4: Match any significant word
         if words:
@@ -480,67 +636,242 @@ class InvoiceAdmin(admin.ModelAdmin):
                             supplier_id=supplier_id, part__in=parts
                         ).values_list('part_id', flat=True)
                         if supplier_parts:
-                            return Part.objects.filter(pk__in=supplier_parts)[:20]
-                    return parts[:20]
+                            return Part.objects.filter(pk__in=supplier_parts)
+                    return parts
 
         return Part.objects.none()
 
-    def _get_part_suggestions(self, item, supplier, limit=3):
-        """Get suggested parts for an invoice item."""
-        # Clean description for search
-        desc = item.description.lower()
-        words = [w for w in re.sub(r'[^\w\s]', ' ', desc).split() if len(w) >= 3]
-        stopwords = {'the', 'and', 'for', 'with', 'pack', 'pcs', 'each', 'new'}
-        words = [w for w in words if w not in stopwords][:4]
+    def _search_parts_trigram(self, query, supplier_id=None):
+        """Fuzzy part search, ranked by trigram similarity (PostgreSQL only).
 
-        if not words:
-            return []
+        Uses the part_name_trgm index, so a single query replaces
+        the multi-strategy LIKE search. Parts from the supplier are ranked first
+        among equally similar parts (an exact name match has similarity 1).
+        """
+        from django.contrib.postgres.search import TrigramSimilarity
 
-        # Try matching with decreasing number of words
-        for n in range(len(words), 0, -1):
-            q = Part.objects.all()
-            for word in words[:n]:
-                q = q.filter(name__icontains=word)
+        parts = Part.objects.annotate(
+            similarity=TrigramSimilarity('name', query)
+        ).filter(similarity__gt=TRIGRAM_SIMILARITY_THRESHOLD)
 
-            if q.exists():
-                # Prefer parts from this supplier
-                supplier_parts = SupplierPart.objects.filter(
-                    supplier=supplier, part__in=q
-                ).select_related('part')[:limit]
+        if supplier_id:
+            parts = parts.annotate(
+                from_supplier=Exists(
+                    SupplierPart.objects.filter(
+                        part=OuterRef('pk'), supplier_id=supplier_id
+                    )
+                )
+            ).order_by('-similarity', '-from_supplier')
+        else:
+            parts = parts.order_by('-similarity')
+
+        return parts
+
+    @staticmethod
+    def _suggestion_words(description: str) -> list[str]:
+        """Return the significant words of an item description, for suggestions."""
+        words = NON_WORD_REGEX.sub(' ', description.lower()).split()
+        return [w for w in words if len(w) >= 3 and w not in SUGGESTION_STOPWORDS][:4]
+
+    def _get_part_suggestions(self, items, supplier, limit=3):
+        """Get suggested parts for a list of invoice items.
+
+        All candidate parts (matching any word of any item) are fetched in a
+        single query, and then matched against each item in Python.
+
+        Returns dict: item pk -> list of suggested parts (as dicts of pk and name)
+        """
+        # Items extracted before description_tokens was added are tokenized here
+        words_by_item = {
+            item.pk: item.description_tokens or self._suggestion_words(item.description)
+            for item in items
+        }
+
+        all_words = set().union(*words_by_item.values())
+
+        if not all_words:
+            return {}
 
-                if supplier_parts:
-                    return [sp.part for sp in supplier_parts]
-                return list(q[:limit])
+        q_objects = Q()
+        for word in all_words:
+            q_objects |= Q(name__icontains=word)
 
-        return []
+        # Skip the default Part prefetches, only the pk and name are needed
+        candidates = Part.objects.prefetch_related(None).filter(q_objects)
+
+        parts = [
+            ({'pk': pk, 'name': name}, name.lower())
+            for pk, name in candidates.values_list('pk', 'name')
+        ]
+
+        # Parts which are available from this supplier
+        supplier_part_ids = set(
+            SupplierPart.objects.filter(
+                supplier=supplier, part__in=candidates
+            ).values_list('part_id', flat=True)
+        )
+
+        suggestions = {}
+
+        for item_pk, words in words_by_item.items():
+            # Try matching with decreasing number of words
+            for n in range(len(words), 0, -1):
+                matches = [
+                    part for part, name in parts if all(w in name for w in words[:n])
+                ]
+
+                if matches:
+                    # Prefer parts from this supplier
+                    preferred = [p for p in matches if p['pk'] in supplier_part_ids]
+                    suggestions[item_pk] = (preferred or matches)[:limit]
+                    break
+
+        return suggestions
 
     def _create_stock_for_invoice(self, invoice, request):
-        """Create stock entries for all matched items in invoice."""
-        created = 0
-        location = StockLocation.objects.first()  # Default location
+        """Create stock entries for all matched items in invoice.
+
+        The StockItems (and their tracking / log entries) are written with bulk INSERTs,
+        so the checks and hooks normally run by StockItem.save() are performed here:
+
+        - Each item is validated with full_clean(), invalid items are logged and skipped
+        - A CREATED tracking entry is added for each new item
+        - Low-stock notifications and pricing updates are scheduled once per part
+        """
+        location = default_location()
+
+        items = list(
+            invoice.items.filter(matched=True, part__isnull=False).select_related(
+                'part'
+            )
+        )
+
+        if not items:
+            return 0
+
+        notes = f'From invoice {invoice.invoice_number}'
+
+        # bulk_create() bypasses save(), so pre-calculate the MPTT fields
+        # (each new StockItem is a top-level node in its own tree)
+        tree_id = StockItem.getNextTreeID()
+
+        valid_items = []
+        stock_items = []
+        logs = []
+
+        for item in items:
+            stock = StockItem(
+                part=item.part,
+                quantity=item.quantity,
+                location=location,
+                notes=notes,
+                tree_id=tree_id,
+                level=0,
+                lft=1,
+                rght=2,
+            )
 
-        for item in invoice.items.filter(matched=True, part__isnull=False):
             try:
-                stock = StockItem.objects.create(
-                    part=item.part,
-                    quantity=item.quantity,
-                    location=location,
-                    notes=f'From invoice {invoice.invoice_number}',
-                )
-                created += 1
-                InvoiceProcessingLog.objects.create(
-                    invoice=invoice,
-                    action='STOCK_CREATE',
-                    message=f'Created stock: {item.part.name} x{item.quantity} (ID: {stock.pk})',
+                stock.full_clean()
+            except ValidationError as e:
+                logs.append(
+                    InvoiceProcessingLog(
+                        invoice=invoice,
+                        action='STOCK_ERROR',
+                        message=f'Failed to create stock for {item.part.name}: {"; ".join(e.messages)}',
+                    )
                 )
-            except Exception as e:
-                InvoiceProcessingLog.objects.create(
-                    invoice=invoice,
-                    action='STOCK_ERROR',
-                    message=f'Failed to create stock for {item.part.name}: {e!s}',
+                continue
+
+            tree_id += 1
+            valid_items.append(item)
+            stock_items.append(stock)
+
+        if not stock_items:
+            InvoiceProcessingLog.objects.bulk_create(logs)
+            return 0
+
+        try:
+            with transaction.atomic():
+                StockItem.objects.bulk_create(stock_items, batch_size=500)
+        except Exception as e:
+            InvoiceProcessingLog.objects.bulk_create([
+                *logs,
+                *(
+                    InvoiceProcessingLog(
+                        invoice=invoice,
+                        action='STOCK_ERROR',
+                        message=f'Failed to create stock for {item.part.name}: {e!s}',
+                    )
+                    for item in valid_items
+                ),
+            ])
+            return 0
+
+        # Primary keys are not set by bulk_create() on all databases (e.g. MySQL)
+        if not all(stock.pk for stock in stock_items):
+            pk_by_tree = dict(
+                StockItem.objects.filter(
+                    tree_id__in=[stock.tree_id for stock in stock_items], level=0
+                ).values_list('tree_id', 'pk')
+            )
+
+            for stock in stock_items:
+                stock.pk = pk_by_tree.get(stock.tree_id)
+
+        StockItemTracking.objects.bulk_create(
+            [
+                stock.add_tracking_entry(
+                    StockHistoryCode.CREATED,
+                    request.user,
+                    deltas={'status': stock.status},
+                    notes=notes,
+                    location=location,
+                    quantity=stock.quantity,
+                    commit=False,
                 )
+                for stock in stock_items
+            ],
+            batch_size=500,
+        )
+
+        # Trigger a single 'created' event for all of the new items
+        trigger_event(
+            StockEvents.ITEMS_CREATED, ids=[stock.pk for stock in stock_items]
+        )
+
+        # Run the post_save hooks of StockItem once for each part
+        # (with the same checks as after_save_stock_item)
+        if not InvenTree.ready.isImportingData():
+            notify = InvenTree.ready.canAppAccessDatabase(allow_test=True)
+            pricing = InvenTree.ready.canAppAccessDatabase(
+                allow_test=settings.TESTING_PRICING
+            )
+
+            for part in {item.part.pk: item.part for item in valid_items}.values():
+                if notify:
+                    offload_task(
+                        part_tasks.notify_low_stock_if_required,
+                        part.pk,
+                        group='notification',
+                        force_async=True,
+                    )
+
+                if pricing:
+                    part.schedule_pricing_update(create=True)
+
+        logs.extend(
+            InvoiceProcessingLog(
+                invoice=invoice,
+                action='STOCK_CREATE',
+                message=f'Created stock: {item.part.name} x{item.quantity} (ID: {stock.pk})',
+            )
+            for item, stock in zip(valid_items, stock_items, strict=True)
+        )
+
+        InvoiceProcessingLog.objects.bulk_create(logs, batch_size=500)
 
-        return created
+        return len(stock_items)
 
     def supplier_name(self, obj):
         """Return supplier name."""
@@ -568,15 +899,13 @@ class InvoiceAdmin(admin.ModelAdmin):
 
     def total_items(self, obj):
         """Return total item count."""
-        return obj.items.count()
+        return obj._total_items
 
     total_items.short_description = 'Items'
 
     def missing_parts_count(self, obj):
         """Return missing parts count badge."""
-        missing = obj.get_missing_parts()
-        if missing:
-            count = len(missing)
+        if count := obj._missing_parts:
             return format_html(
                 '<span style="color: red;"><strong>{} missing</strong></span>', count
             )
@@ -586,15 +915,54 @@ class InvoiceAdmin(admin.ModelAdmin):
 
     def invoice_data_display(self, obj):
         """Return formatted invoice data."""
-        return format_html('<pre>{}</pre>', json.dumps(obj.invoice_data, indent=2))
+        return format_html('<pre>{}</pre>', format_invoice_data(obj))
 
     invoice_data_display.short_description = 'Raw Invoice Data'
 
+    def recent_logs(self, obj):
+        """Return the most recent processing log entries, with a link to the full log."""
+        if not obj.pk:
+            return '-'
+
+        logs = list(
+            obj.processing_logs.only('action', 'message', 'created_at').order_by(
+                '-created_at'
+            )[: RECENT_LOG_COUNT + 1]
+        )
+
+        if not logs:
+            return '-'
+
+        rows = format_html_join(
+            '',
+            '<tr><td>{}</td><td>{}</td><td>{}</td></tr>',
+            (
+                (log.created_at.strftime('%Y-%m-%d %H:%M:%S'), log.action, log.message)
+                for log in logs[:RECENT_LOG_COUNT]
+            ),
+        )
+
+        table = format_html('<table>{}</table>', rows)
+
+        if len(logs) > RECENT_LOG_COUNT:
+            # Older entries are available (paginated) in the processing log admin
+            url = reverse('admin:invoice_manager_invoiceprocessinglog_changelist')
+            table = format_html(
+                '{}<a href="{}?invoice__id__exact={}">View all log entries</a>',
+                table,
+                url,
+                obj.pk,
+            )
+
+        return table
+
+    recent_logs.short_description = 'Recent Log Entries'
+
     def match_parts_link(self, obj):
         """Link to match parts view."""
-        if obj.items.exists():
+        if obj._total_items:
             url = reverse('admin:invoice_manager_invoice_match', args=[obj.pk])
-            unmatched = obj.items.filter(matched=False).count()
+            unmatched = obj._unmatched_items
             if unmatched > 0:
                 return format_html(
                     '<a href="{}" style="background:#ffc107;color:#333;padding:4px 10px;border-radius:4px;text-decoration:none;">Match Parts ({})</a>',
@@ -626,8 +994,11 @@ class InvoiceAdmin(admin.ModelAdmin):
 
     @admin.action(description='Extract invoice data from PDF')
     def extract_invoice_data(self, request, queryset):
-        """Extract data from uploaded PDF files."""
-        from .extractors import get_extractor_for_supplier
+        """Extract data from uploaded PDF files.
+
+        If a background worker is running, each invoice is extracted in a separate task.
+        """
+        worker_running = is_worker_running()
 
         for invoice in queryset:
             if invoice.status != 'PENDING':
@@ -638,118 +1009,163 @@ class InvoiceAdmin(admin.ModelAdmin):
                 )
                 continue
 
-            try:
+            if worker_running:
                 invoice.status = 'PROCESSING'
                 invoice.save()
 
-                # Get extractor for supplier
-                extractor = get_extractor_for_supplier(invoice.supplier.name)
-
-                # Extract data from PDF
-                _raw_text, extracted_data = extractor.convert_pdf_with_fitz(
-                    invoice.invoice_file.path
+                offload_task(
+                    invoice_manager.tasks.extract_invoice,
+                    invoice.pk,
+                    force_async=True,
+                    group='invoice',
+                    timeout=max_task_timeout(),
                 )
 
-                # Update invoice with extracted data
-                invoice.invoice_data = extracted_data
-                invoice.total_net_amount = extracted_data.get(
-                    'invoice_metadata', {}
-                ).get('total_net_amount', 0)
-                invoice.total_vat_amount = extracted_data.get(
-                    'invoice_metadata', {}
-                ).get('total_vat_amount', 0)
-                invoice.invoice_total = extracted_data.get('invoice_metadata', {}).get(
-                    'invoice_total', 0
+                self.message_user(
+                    request,
+                    f'Extracting {invoice.invoice_number} in the background',
+                    messages.INFO,
                 )
+                continue
 
-                # Create invoice items
-                self._create_invoice_items(invoice, extracted_data)
-
-                invoice.status = 'COMPLETED'
-                invoice.processed_at = datetime.now()
-                invoice.save()
-
-                InvoiceProcessingLog.objects.create(
-                    invoice=invoice,
-                    action='EXTRACT',
-                    message=f'Successfully extracted {len(extracted_data.get("products", []))} items from invoice',
-                )
+            try:
+                count = invoice_manager.tasks.extract_invoice(invoice.pk)
 
                 self.message_user(
                     request,
-                    f'Successfully extracted data from {invoice.invoice_number}',
+                    f'Successfully extracted {count} items from {invoice.invoice_number}',
                     messages.SUCCESS,
                 )
 
             except Exception as e:
-                invoice.status = 'FAILED'
-                invoice.error_message = str(e)
-                invoice.save()
-
-                InvoiceProcessingLog.objects.create(
-                    invoice=invoice,
-                    action='ERROR',
-                    message=f'Failed to extract invoice: {e!s}',
-                )
-
                 self.message_user(
                     request,
                     f'Failed to extract {invoice.invoice_number}: {e!s}',
                     messages.ERROR,
                 )
 
-    def _create_invoice_items(self, invoice: Invoice, extracted_data: dict):
-        """Create invoice items from extracted data."""
+    @classmethod
+    def _create_invoice_items(cls, invoice: Invoice, extracted_data: dict):
+        """Create invoice items from extracted data.
+
+        Items which already exist for the invoice (same seller SKU and description)
+        are skipped, and the new items are inserted in bulk.
+        """
+        existing = set(
+            InvoiceItem.objects.filter(invoice=invoice).values_list(
+                'seller_sku', 'description'
+            )
+        )
+
+        new_items = []
+
         for product in extracted_data.get('products', []):
-            _item, _created = InvoiceItem.objects.get_or_create(
-                invoice=invoice,
-                seller_sku=product.get('seller_sku', ''),
-                description=product.get('description', ''),
-                defaults={
-                    'quantity': product.get('quantity', 0),
-                    'unit_price': product.get('unit_price', 0),
-                    'total_price': product.get('total_price', 0),
-                    'tax_rate': product.get('tax', 20),
-                },
+            seller_sku = product.get('seller_sku', '')
+            description = product.get('description', '')
+
+            if (seller_sku, description) in existing:
+                continue
+
+            existing.add((seller_sku, description))
+
+            new_items.append(
+                InvoiceItem(
+                    invoice=invoice,
+                    seller_sku=seller_sku,
+                    description=description,
+                    parsed_name=cls._parse_name(description),
+                    description_tokens=cls._suggestion_words(description),
+                    quantity=product.get('quantity', 0),
+                    unit_price=product.get('unit_price', 0),
+                    total_price=product.get('total_price', 0),
+                    tax_rate=product.get('tax', 20),
+                )
             )
 
+        InvoiceItem.objects.bulk_create(
+            new_items, batch_size=500, ignore_conflicts=True
+        )
+
     @admin.action(description='Auto-match parts (by description)')
     def auto_match_parts(self, request, queryset):
-        """Try to automatically match invoice items to parts."""
+        """Try to automatically match invoice items to parts.
+
+        Items are first matched by supplier SKU (one query per invoice),
+        and only the remaining items fall back to matching by description.
+        """
         matched_count = 0
         unmatched_count = 0
 
-        for invoice in queryset:
-            for item in invoice.items.filter(part__isnull=True):
-                part = self._find_matching_part(item, invoice.supplier)
+        matched_items = []
+        logs = []
+
+        for invoice in queryset.select_related('supplier'):
+            items = list(invoice.items.filter(part__isnull=True))
+
+            sku_map = self._parts_by_sku(
+                invoice.supplier, {item.seller_sku for item in items if item.seller_sku}
+            )
+
+            for item in items:
+                part = sku_map.get(item.seller_sku) or self._find_matching_part(
+                    item, invoice.supplier, match_sku=False
+                )
 
                 if part:
-                    item.match_part(part)
+                    item.part = part
+                    item.matched = True
+                    matched_items.append(item)
                     matched_count += 1
-                    InvoiceProcessingLog.objects.create(
-                        invoice=invoice,
-                        action='MATCH',
-                        message=f"Auto-matched '{item.description[:50]}' to {part.name}",
+                    logs.append(
+                        InvoiceProcessingLog(
+                            invoice=invoice,
+                            action='MATCH',
+                            message=f"Auto-matched '{item.description[:50]}' to {part.name}",
+                        )
                     )
                 else:
                     unmatched_count += 1
 
+        # Save the matches and their log entries together
+        with transaction.atomic():
+            InvoiceItem.objects.bulk_update(
+                matched_items, ['part', 'matched'], batch_size=500
+            )
+            InvoiceProcessingLog.objects.bulk_create(logs, batch_size=500)
+
         self.message_user(
             request,
             f'Matched {matched_count} items. {unmatched_count} items require manual matching.',
             messages.SUCCESS if matched_count > 0 else messages.WARNING,
         )
 
-    def _find_matching_part(self, item, supplier):
+    def _parts_by_sku(self, supplier, skus):
+        """Return a map of supplier SKU to Part, for the given supplier SKUs."""
+        if not skus:
+            return {}
+
+        return {
+            supplier_part.SKU: supplier_part.part
+            for supplier_part in SupplierPart.objects.filter(
+                supplier=supplier, SKU__in=skus
+            ).select_related('part')
+        }
+
+    def _find_matching_part(self, item, supplier, match_sku=True):
         """Find matching part for invoice item.
 
         Strategy:
         1. Try to match by SupplierPart.SKU (most reliable for Shure etc.)
         2. Try to match by description
         3. Try fuzzy match by keywords
+
+        Arguments:
+            item: The InvoiceItem to match
+            supplier: The supplier of the invoice
+            match_sku: Set to False if the SKU has already been checked (see _parts_by_sku)
         """
         # Strategy 1: Match by SupplierPart SKU (primary method for Shure)
-        if item.seller_sku:
+        if match_sku and item.seller_sku:
             supplier_part = (
                 SupplierPart.objects.filter(supplier=supplier, SKU=item.seller_sku)
                 .select_related('part')
@@ -760,10 +1176,10 @@ class InvoiceAdmin(admin.ModelAdmin):
 
         # Strategy 2: Exact description match
         try:
-            return Part.objects.get(name__iexact=item.description)
+            return parts_named(item.description).get()
         except Part.MultipleObjectsReturned:
             # Multiple matches - try to filter by supplier
-            parts = Part.objects.filter(name__iexact=item.description)
+            parts = parts_named(item.description)
             supplier_part = SupplierPart.objects.filter(
                 part__in=parts, supplier=supplier
             ).first()
@@ -990,6 +1406,7 @@ class InvoiceProcessingLogAdmin(admin.ModelAdmin):
     """Admin interface for processing logs."""
 
     list_display = ('invoice_number', 'action', 'created_at', 'message_preview')
+    list_select_related = ('invoice',)
     list_filter = ('action', 'invoice__supplier', 'created_at')
     search_fields = ('invoice__invoice_number', 'message')
     readonly_fields = ('invoice', 'action', 'message', 'created_at')
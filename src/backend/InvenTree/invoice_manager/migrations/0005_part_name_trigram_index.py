@@ -0,0 +1,35 @@
+# Trigram index on the Part name, used for fuzzy part search (PostgreSQL only)
+
+from django.db import migrations
+
+
+def create_trigram_index(apps, schema_editor):
+    """Create the pg_trgm extension and a GIN trigram index on part_part.name."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS part_name_trgm '
+        'ON part_part USING gin (name gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    """Remove the trigram index (the extension is left in place)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('DROP INDEX IF EXISTS part_name_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("invoice_manager", "0004_invoice_purchase_order"),
+        ("part", "0143_alter_part_image"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, reverse_code=drop_trigram_index),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-16 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("invoice_manager", "0005_part_name_trigram_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="invoiceitem",
+            name="parsed_name",
+            field=models.CharField(
+                blank=True,
+                help_text="Product name parsed from the description",
+                max_length=120,
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-16 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("invoice_manager", "0006_invoiceitem_parsed_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="invoiceitem",
+            name="description_tokens",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                help_text="Significant words of the description, used for part suggestions",
+            ),
+        ),
+    ]
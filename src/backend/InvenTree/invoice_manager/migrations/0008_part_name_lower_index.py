@@ -0,0 +1,50 @@
+# Index on lower(part_part.name), used for case-insensitive part name lookups
+
+from django.db import migrations
+
+
+def index_exists(connection):
+    """Return True if the part_name_lower index exists."""
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, 'part_part')
+
+    return 'part_name_lower' in constraints
+
+
+def create_name_lower_index(apps, schema_editor):
+    """Create the part_name_lower expression index (if it does not already exist)."""
+    if index_exists(schema_editor.connection):
+        return
+
+    if schema_editor.connection.vendor == 'mysql':
+        # MySQL requires functional key parts to be wrapped in parentheses
+        schema_editor.execute(
+            'CREATE INDEX part_name_lower ON part_part ((LOWER(name)))'
+        )
+    else:
+        schema_editor.execute('CREATE INDEX part_name_lower ON part_part (LOWER(name))')
+
+
+def drop_name_lower_index(apps, schema_editor):
+    """Remove the part_name_lower index."""
+    if not index_exists(schema_editor.connection):
+        return
+
+    if schema_editor.connection.vendor == 'mysql':
+        schema_editor.execute('DROP INDEX part_name_lower ON part_part')
+    else:
+        schema_editor.execute('DROP INDEX part_name_lower')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("invoice_manager", "0007_invoiceitem_description_tokens"),
+        ("part", "0143_alter_part_image"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_name_lower_index, reverse_code=drop_name_lower_index
+        ),
+    ]
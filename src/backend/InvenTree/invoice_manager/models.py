@@ -1,10 +1,67 @@
 """Django models for invoice management."""
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 from company.models import Company
-from part.models import Part
+from part.models import Part, PartCategory
+from stock.models import StockLocation
+
+# Cache keys (and timeout, in seconds) for the default location and category choices
+DEFAULT_LOCATION_CACHE_KEY = 'invoice_manager:default_location'
+CATEGORY_CHOICES_CACHE_KEY = 'invoice_manager:category_choices'
+CHOICES_CACHE_TIMEOUT = 300
+
+
+def default_location_id():
+    """Return the ID of the first non-structural StockLocation (or None)."""
+    return (
+        StockLocation.objects.filter(structural=False)
+        .order_by('pk')
+        .values_list('pk', flat=True)
+        .first()
+    )
+
+
+def default_location():
+    """Return the default StockLocation for invoice stock (or None).
+
+    The ID is cached, and the receivers below only clear the cache of this process,
+    so the cached location is checked (it must still exist, and not be structural).
+    """
+    # 0 is cached when there is no location, as None is treated as a cache miss
+    location_id = cache.get_or_set(
+        DEFAULT_LOCATION_CACHE_KEY,
+        lambda: default_location_id() or 0,
+        CHOICES_CACHE_TIMEOUT,
+    )
+
+    if location_id and (
+        location := StockLocation.objects.filter(
+            pk=location_id, structural=False
+        ).first()
+    ):
+        return location
+
+    # Cached location is stale (or there was none): look it up again
+    location_id = default_location_id()
+    cache.set(DEFAULT_LOCATION_CACHE_KEY, location_id or 0, CHOICES_CACHE_TIMEOUT)
+
+    return StockLocation.objects.filter(pk=location_id).first() if location_id else None
+
+
+def category_choices():
+    """Return the PartCategory choices (pk and pathstring) for the create part modal."""
+    return cache.get_or_set(
+        CATEGORY_CHOICES_CACHE_KEY,
+        lambda: list(
+            PartCategory.objects.order_by('pathstring').values('pk', 'pathstring')
+        ),
+        CHOICES_CACHE_TIMEOUT,
+    )
 
 
 class Invoice(models.Model):
@@ -95,6 +152,14 @@ class InvoiceItem(models.Model):
 
     # Item details from invoice
     description = models.TextField()
+    parsed_name = models.CharField(
+        max_length=120, blank=True, help_text='Product name parsed from the description'
+    )
+    description_tokens = models.JSONField(
+        default=list,
+        blank=True,
+        help_text='Significant words of the description, used for part suggestions',
+    )
     seller_sku = models.CharField(max_length=100, blank=True, null=True)
     quantity = models.PositiveIntegerField()
     unit_price = models.DecimalField(max_digits=12, decimal_places=2)
@@ -169,3 +234,17 @@ class InvoiceProcessingLog(models.Model):
     def __str__(self):
         """Return string representation."""
         return f'{self.invoice.invoice_number} - {self.action} at {self.created_at}'
+
+
+@receiver(post_save, sender=StockLocation, dispatch_uid='invoice_location_saved')
+@receiver(post_delete, sender=StockLocation, dispatch_uid='invoice_location_deleted')
+def clear_default_location_cache(sender, **kwargs):
+    """Clear the cached default location when a StockLocation changes."""
+    cache.delete(DEFAULT_LOCATION_CACHE_KEY)
+
+
+@receiver(post_save, sender=PartCategory, dispatch_uid='invoice_category_saved')
+@receiver(post_delete, sender=PartCategory, dispatch_uid='invoice_category_deleted')
+def clear_category_choices_cache(sender, **kwargs):
+    """Clear the cached category choices when a PartCategory changes."""
+    cache.delete(CATEGORY_CHOICES_CACHE_KEY)
@@ -0,0 +1,95 @@
+"""Task definitions for the 'invoice_manager' app."""
+
+from datetime import datetime, timedelta
+
+import InvenTree.helpers
+import InvenTree.tasks
+
+
+def extract_invoice(invoice_id: int) -> int:
+    """Extract the data (and items) of an invoice from its uploaded PDF file.
+
+    Runs either in the request, or as a background task
+    (with a timeout of max_task_timeout() seconds).
+
+    Arguments:
+        invoice_id: Primary key of the Invoice to extract
+
+    Returns:
+        The number of products extracted from the invoice
+
+    Raises:
+        Exception: If the extraction failed (the invoice is marked as FAILED)
+    """
+    from invoice_manager.admin import InvoiceAdmin
+    from invoice_manager.extractors import get_extractor_for_supplier
+    from invoice_manager.models import Invoice, InvoiceProcessingLog
+
+    invoice = Invoice.objects.select_related('supplier').get(pk=invoice_id)
+
+    try:
+        invoice.status = 'PROCESSING'
+        invoice.save()
+
+        # Get extractor for supplier
+        extractor = get_extractor_for_supplier(invoice.supplier.name)
+
+        # Extract data from PDF
+        _raw_text, extracted_data = extractor.convert_pdf_with_fitz(
+            invoice.invoice_file.path
+        )
+
+        # Update invoice with extracted data
+        metadata = extracted_data.get('invoice_metadata', {})
+        invoice.invoice_data = extracted_data
+        invoice.total_net_amount = metadata.get('total_net_amount', 0)
+        invoice.total_vat_amount = metadata.get('total_vat_amount', 0)
+        invoice.invoice_total = metadata.get('invoice_total', 0)
+
+        # Create invoice items
+        InvoiceAdmin._create_invoice_items(invoice, extracted_data)
+
+        invoice.status = 'COMPLETED'
+        invoice.processed_at = datetime.now()
+        invoice.save()
+
+        count = len(extracted_data.get('products', []))
+
+        InvoiceProcessingLog.objects.create(
+            invoice=invoice,
+            action='EXTRACT',
+            message=f'Successfully extracted {count} items from invoice',
+        )
+
+    except Exception as e:
+        invoice.status = 'FAILED'
+        invoice.error_message = str(e)
+        invoice.save()
+
+        InvoiceProcessingLog.objects.create(
+            invoice=invoice, action='ERROR', message=f'Failed to extract invoice: {e!s}'
+        )
+
+        raise
+
+    return count
+
+
+def fail_stale_invoice_extractions():
+    """Mark invoices whose extraction can no longer finish as failed.
+
+    A background extraction which is killed (e.g. when it exceeds the task timeout)
+    never reaches its error handler, so its invoice would stay 'processing'.
+    The invoice is saved when the extraction starts, so 'updated_at' is the start time.
+    """
+    from invoice_manager.models import Invoice
+
+    # Allow a margin on top of the task timeout
+    before = InvenTree.helpers.current_time() - timedelta(
+        seconds=InvenTree.tasks.max_task_timeout() + 60
+    )
+
+    Invoice.objects.filter(status='PROCESSING', updated_at__lt=before).update(
+        status='FAILED',
+        error_message='Extraction did not finish (the background task was stopped or timed out)',
+    )
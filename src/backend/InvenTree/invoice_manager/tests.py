@@ -0,0 +1,381 @@
+"""Unit tests for the 'invoice_manager' app."""
+
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.urls import reverse
+
+import invoice_manager.tasks
+from company.models import Company, SupplierPart
+from InvenTree.helpers import current_time
+from InvenTree.unit_test import AdminTestCase, InvenTreeTestCase
+from invoice_manager.admin import InvoiceAdmin
+from invoice_manager.models import (
+    DEFAULT_LOCATION_CACHE_KEY,
+    Invoice,
+    InvoiceItem,
+    InvoiceProcessingLog,
+    default_location,
+)
+from part.models import Part
+from stock.models import StockItem, StockItemTracking, StockLocation
+from stock.status_codes import StockHistoryCode
+
+EXTRACTED_DATA = {
+    'invoice_metadata': {
+        'total_net_amount': 100,
+        'total_vat_amount': 20,
+        'invoice_total': 120,
+    },
+    'products': [
+        {
+            'seller_sku': 'SM58-LC',
+            'description': 'Shure SM58 Dynamic Vocal Microphone',
+            'quantity': 2,
+            'unit_price': 30,
+            'total_price': 60,
+            'tax': 20,
+        },
+        {
+            'seller_sku': '',
+            'description': 'XLR Cable 3m Line Weight: 0.2kg',
+            'quantity': 4,
+            'unit_price': 10,
+            'total_price': 40,
+            'tax': 20,
+        },
+    ],
+}
+
+
+class InvoiceTestMixin:
+    """Helpers for invoice tests."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create the supplier and an invoice."""
+        super().setUpTestData()
+
+        cls.supplier = Company.objects.create(
+            name='Shure', description='A supplier', is_supplier=True
+        )
+
+        cls.invoice = Invoice.objects.create(
+            invoice_number='INV-0001',
+            invoice_date=date(2024, 7, 1),
+            supplier=cls.supplier,
+            invoice_file='invoices/INV-0001.pdf',
+        )
+
+    def create_item(self, description: str, quantity: int = 1, **kwargs):
+        """Create an item for the test invoice."""
+        return InvoiceItem.objects.create(
+            invoice=self.invoice,
+            description=description,
+            quantity=quantity,
+            unit_price=Decimal('10.00'),
+            total_price=Decimal('10.00') * quantity,
+            **kwargs,
+        )
+
+    def logs(self, action: str):
+        """Return the messages of the invoice logs for an action."""
+        return list(
+            InvoiceProcessingLog.objects.filter(
+                invoice=self.invoice, action=action
+            ).values_list('message', flat=True)
+        )
+
+
+class InvoiceExtractionTest(InvoiceTestMixin, InvenTreeTestCase):
+    """Tests for creating the items of an invoice from the extracted data."""
+
+    def test_create_invoice_items(self):
+        """Items are created from the extracted products."""
+        InvoiceAdmin._create_invoice_items(self.invoice, EXTRACTED_DATA)
+
+        items = list(self.invoice.items.all())
+        self.assertEqual(len(items), 2)
+
+        self.assertEqual(items[0].seller_sku, 'SM58-LC')
+        self.assertEqual(items[0].quantity, 2)
+        self.assertEqual(items[0].unit_price, 30)
+        self.assertFalse(items[0].matched)
+
+        # The name is parsed from the description
+        self.assertEqual(items[1].parsed_name, 'XLR Cable 3m')
+        self.assertEqual(items[1].total_price, 40)
+
+        # Creating the items again does not duplicate them
+        InvoiceAdmin._create_invoice_items(self.invoice, EXTRACTED_DATA)
+        self.assertEqual(self.invoice.items.count(), 2)
+
+        # Only new products are added
+        data = {
+            'products': [
+                *EXTRACTED_DATA['products'],
+                {'seller_sku': 'A25D', 'description': 'Mic Clip', 'quantity': 1},
+            ]
+        }
+
+        InvoiceAdmin._create_invoice_items(self.invoice, data)
+        self.assertEqual(self.invoice.items.count(), 3)
+
+    @mock.patch('invoice_manager.extractors.get_extractor_for_supplier')
+    def test_extract_invoice(self, get_extractor):
+        """The invoice is updated with the extracted data."""
+        get_extractor.return_value.convert_pdf_with_fitz.return_value = (
+            'text',
+            EXTRACTED_DATA,
+        )
+
+        count = invoice_manager.tasks.extract_invoice(self.invoice.pk)
+        self.assertEqual(count, 2)
+
+        self.invoice.refresh_from_db()
+        self.assertEqual(self.invoice.status, 'COMPLETED')
+        self.assertEqual(self.invoice.invoice_total, 120)
+        self.assertIsNotNone(self.invoice.processed_at)
+        self.assertEqual(self.invoice.items.count(), 2)
+        self.assertEqual(len(self.logs('EXTRACT')), 1)
+
+        # Extracting the invoice again does not duplicate the items
+        invoice_manager.tasks.extract_invoice(self.invoice.pk)
+        self.assertEqual(self.invoice.items.count(), 2)
+
+    @mock.patch('invoice_manager.extractors.get_extractor_for_supplier')
+    def test_extract_invoice_failed(self, get_extractor):
+        """The invoice is marked as failed if the extraction fails."""
+        get_extractor.return_value.convert_pdf_with_fitz.side_effect = ValueError(
+            'Invalid PDF'
+        )
+
+        with self.assertRaises(ValueError):
+            invoice_manager.tasks.extract_invoice(self.invoice.pk)
+
+        self.invoice.refresh_from_db()
+        self.assertEqual(self.invoice.status, 'FAILED')
+        self.assertEqual(self.invoice.error_message, 'Invalid PDF')
+        self.assertEqual(self.invoice.items.count(), 0)
+        self.assertIn('Invalid PDF', self.logs('ERROR')[0])
+
+    def test_fail_stale_invoice_extractions(self):
+        """Invoices stuck in processing (past the task timeout) are marked as failed."""
+        self.invoice.status = 'PROCESSING'
+        self.invoice.save()
+
+        # A recent extraction is left alone
+        invoice_manager.tasks.fail_stale_invoice_extractions()
+        self.invoice.refresh_from_db()
+        self.assertEqual(self.invoice.status, 'PROCESSING')
+
+        # 'updated_at' is set on save, so update it directly
+        Invoice.objects.filter(pk=self.invoice.pk).update(
+            updated_at=current_time() - timedelta(days=1)
+        )
+
+        invoice_manager.tasks.fail_stale_invoice_extractions()
+        self.invoice.refresh_from_db()
+        self.assertEqual(self.invoice.status, 'FAILED')
+        self.assertIn('did not finish', self.invoice.error_message)
+
+
+class InvoiceDefaultLocationTest(InvenTreeTestCase):
+    """Tests for the default location of invoice stock."""
+
+    def setUp(self):
+        """Clear the cached location."""
+        super().setUp()
+        cache.delete(DEFAULT_LOCATION_CACHE_KEY)
+
+    def test_default_location(self):
+        """The first non-structural location is used."""
+        self.assertIsNone(default_location())
+
+        StockLocation.objects.create(name='Warehouse', structural=True)
+        self.assertIsNone(default_location())
+
+        shelf = StockLocation.objects.create(name='Shelf')
+        self.assertEqual(default_location(), shelf)
+
+    def test_stale_location(self):
+        """A cached location which was deleted or made structural is not used."""
+        shelf = StockLocation.objects.create(name='Shelf')
+        other = StockLocation.objects.create(name='Other Shelf')
+
+        self.assertEqual(default_location(), shelf)
+
+        # The cache is only cleared in this process, so set it again
+        shelf.structural = True
+        shelf.save()
+        cache.set(DEFAULT_LOCATION_CACHE_KEY, shelf.pk)
+
+        self.assertEqual(default_location(), other)
+        self.assertEqual(cache.get(DEFAULT_LOCATION_CACHE_KEY), other.pk)
+
+        other_pk = other.pk
+        other.delete()
+        cache.set(DEFAULT_LOCATION_CACHE_KEY, other_pk)
+
+        self.assertIsNone(default_location())
+        self.assertEqual(cache.get(DEFAULT_LOCATION_CACHE_KEY), 0)
+
+
+class InvoiceAdminTest(InvoiceTestMixin, AdminTestCase):
+    """Tests for matching invoice items, and creating stock, in the admin."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create the parts and a stock location."""
+        super().setUpTestData()
+
+        cls.location = StockLocation.objects.create(name='Shelf')
+
+        cls.microphone = Part.objects.create(
+            name='SM58 Microphone', description='A microphone'
+        )
+        cls.cable = Part.objects.create(name='XLR Cable', description='A cable')
+        cls.license = Part.objects.create(
+            name='Software License', description='A license', virtual=True
+        )
+
+        SupplierPart.objects.create(
+            part=cls.microphone, supplier=cls.supplier, SKU='SM58-LC'
+        )
+
+    def setUp(self):
+        """Clear the cached location."""
+        super().setUp()
+        cache.delete(DEFAULT_LOCATION_CACHE_KEY)
+
+    def match(self, parts: dict, action: str = 'save'):
+        """Post the matched parts (a dict of InvoiceItem to Part) for the invoice."""
+        data = {'action': action}
+
+        for item, part in parts.items():
+            data[f'part_{item.pk}'] = part.pk if part else ''
+
+        return self.post(
+            reverse('admin:invoice_manager_invoice_match', args=[self.invoice.pk]),
+            data,
+            expected_code=302,
+            format='multipart',
+        )
+
+    def test_auto_match_parts(self):
+        """Items are matched by supplier SKU, then by name."""
+        by_sku = self.create_item('Dynamic Microphone', seller_sku='SM58-LC')
+        by_name = self.create_item('xlr cable')
+        unmatched = self.create_item('Unknown Thing')
+
+        self.post(
+            reverse('admin:invoice_manager_invoice_changelist'),
+            {'action': 'auto_match_parts', '_selected_action': [self.invoice.pk]},
+            expected_code=302,
+            format='multipart',
+        )
+
+        for item in (by_sku, by_name, unmatched):
+            item.refresh_from_db()
+
+        self.assertEqual(by_sku.part, self.microphone)
+        self.assertTrue(by_sku.matched)
+        self.assertEqual(by_name.part, self.cable)
+        self.assertIsNone(unmatched.part)
+        self.assertFalse(unmatched.matched)
+        self.assertEqual(len(self.logs('MATCH')), 2)
+
+    def test_match_parts(self):
+        """Parts are matched (and unmatched) from the match view."""
+        microphone = self.create_item('Microphone')
+        cable = self.create_item('Cable')
+
+        self.match({microphone: self.microphone, cable: self.cable})
+
+        microphone.refresh_from_db()
+        cable.refresh_from_db()
+        self.assertEqual(microphone.part, self.microphone)
+        self.assertTrue(cable.matched)
+        self.assertEqual(len(self.logs('MANUAL_MATCH')), 2)
+
+        # Saving the same matches again does not log them again
+        self.match({microphone: self.microphone, cable: self.cable})
+        self.assertEqual(len(self.logs('MANUAL_MATCH')), 2)
+
+        # Clear a match
+        self.match({microphone: self.microphone, cable: None})
+
+        cable.refresh_from_db()
+        self.assertIsNone(cable.part)
+        self.assertFalse(cable.matched)
+
+        # No stock is created without 'save_and_stock'
+        self.assertEqual(StockItem.objects.count(), 0)
+
+    def test_create_stock(self):
+        """Stock is created for the matched items."""
+        microphone = self.create_item('Microphone', quantity=2)
+        cable = self.create_item('Cable', quantity=4)
+        self.create_item('Unknown Thing')
+
+        # A structural location is never used for the stock
+        StockLocation.objects.create(name='Warehouse', structural=True)
+
+        self.match(
+            {microphone: self.microphone, cable: self.cable}, action='save_and_stock'
+        )
+
+        items = StockItem.objects.order_by('pk')
+        self.assertEqual(items.count(), 2)
+
+        for stock, part, quantity in zip(
+            items, (self.microphone, self.cable), (2, 4), strict=True
+        ):
+            self.assertEqual(stock.part, part)
+            self.assertEqual(stock.quantity, quantity)
+            self.assertEqual(stock.location, self.location)
+            self.assertEqual(stock.notes, 'From invoice INV-0001')
+
+            # Each item is a separate (valid) tree
+            self.assertEqual(stock.level, 0)
+            self.assertEqual(stock.get_descendant_count(), 0)
+
+            tracking = StockItemTracking.objects.get(item=stock)
+            self.assertEqual(tracking.tracking_type, StockHistoryCode.CREATED.value)
+            self.assertEqual(tracking.user, self.user)
+            self.assertEqual(tracking.deltas['quantity'], quantity)
+
+        self.assertEqual(len({stock.tree_id for stock in items}), 2)
+        self.assertEqual(len(self.logs('STOCK_CREATE')), 2)
+
+    def test_create_stock_invalid(self):
+        """Items which fail validation are logged, and the others are created."""
+        microphone = self.create_item('Microphone')
+        licence_item = self.create_item('License')
+
+        self.match(
+            {microphone: self.microphone, licence_item: self.license},
+            action='save_and_stock',
+        )
+
+        self.assertEqual(StockItem.objects.count(), 1)
+        self.assertEqual(StockItem.objects.get().part, self.microphone)
+
+        self.assertEqual(len(self.logs('STOCK_CREATE')), 1)
+
+        errors = self.logs('STOCK_ERROR')
+        self.assertEqual(len(errors), 1)
+        self.assertIn('Software License', errors[0])
+        self.assertIn('virtual', errors[0])
+
+    def test_create_stock_no_location(self):
+        """Stock is created without a location if there is no valid location."""
+        self.location.structural = True
+        self.location.save()
+
+        microphone = self.create_item('Microphone')
+        self.match({microphone: self.microphone}, action='save_and_stock')
+
+        self.assertIsNone(StockItem.objects.get().location)